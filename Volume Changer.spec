@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('image.ico', '.')],
+    datas=[('assets.pak', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,60 @@
+import re
+import fnmatch
+import psutil
+from functools import lru_cache
+
+# Characters that make an app name a glob pattern
+GLOB_CHARS = '*?['
+
+
+class AppTarget:
+    """An app name from the settings, matching every process/session it covers.
+
+    Plain names ('discord.exe') match exactly, names containing glob characters
+    ('*discord*.exe') match as globs and names starting with 're:' are regular
+    expressions. Matching is case-insensitive like Windows process names.
+    """
+    def __init__(self, pattern):
+        self.pattern = pattern
+        if pattern.startswith('re:'):
+            self.regex = re.compile(pattern[3:], re.IGNORECASE)
+        elif any(c in pattern for c in GLOB_CHARS):
+            self.regex = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+        else:
+            self.regex = None
+        self.name = pattern.lower()
+
+    @property
+    def is_pattern(self):
+        return self.regex is not None
+
+    def matches(self, process_name):
+        if not process_name:
+            return False
+        if self.regex is None:
+            return process_name.lower() == self.name
+        return self.regex.fullmatch(process_name) is not None
+
+    def filter_sessions(self, by_name):
+        """Return every session for this target from an index_sessions() map"""
+        if self.regex is None:
+            return list(by_name.get(self.name, []))
+        sessions = []
+        for name, group in by_name.items():
+            if self.matches(name):
+                sessions.extend(group)
+        return sessions
+
+    def find_processes(self):
+        """Return info dicts (pid, name, exe) for every matching process"""
+        processes = []
+        for proc in psutil.process_iter(['pid', 'name', 'exe']):
+            if self.matches(proc.info['name']):
+                processes.append(proc.info)
+        return processes
+
+
+@lru_cache(maxsize=64)
+def get_target(pattern):
+    """Get the compiled target for an app name, compiling each pattern once"""
+    return AppTarget(pattern)
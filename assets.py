@@ -0,0 +1,168 @@
+import io
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import threading
+from PIL import Image
+
+BUNDLE_NAME = "assets.pak"
+BUNDLE_MAGIC = b"LVCPAK1\n"
+# Files packed into the bundle by `python assets.py`
+BUNDLED_FILES = ["image.ico", "disabled.ico"]
+
+
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller"""
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+def build_bundle(paths, out_path):
+    """Pack files into one bundle: magic, index length, JSON index, then the data"""
+    index = {}
+    blobs = []
+    offset = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        index[os.path.basename(path)] = [offset, len(data)]
+        blobs.append(data)
+        offset += len(data)
+    index_bytes = json.dumps(index).encode('utf-8')
+    with open(out_path, 'wb') as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(struct.pack('<I', len(index_bytes)))
+        f.write(index_bytes)
+        for data in blobs:
+            f.write(data)
+    return index
+
+
+class AssetRegistry:
+    """Loads each asset once, on first use, and shares it between windows.
+
+    Assets come from the packed bundle, memory-mapped so only the bytes of
+    assets actually used are read, and fall back to loose files next to the
+    app. Decoded images, disabled badges per size and Tk photos are cached.
+    """
+    def __init__(self, bundle_path=None):
+        self.bundle_path = bundle_path or resource_path(BUNDLE_NAME)
+        self.lock = threading.Lock()
+        self.bundle = None
+        self.index = None
+        self.images = {}
+        self.badges = {}
+        self.photos = {}
+        # Startup cost accounting
+        self.bytes_read = 0
+        self.decode_time = {}
+
+    def _open_bundle(self):
+        if self.index is not None:
+            return
+        self.index = {}
+        if not os.path.exists(self.bundle_path):
+            return
+        try:
+            with open(self.bundle_path, 'rb') as f:
+                self.bundle = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.bundle[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+                raise ValueError("not an asset bundle")
+            start = len(BUNDLE_MAGIC)
+            (index_length,) = struct.unpack('<I', self.bundle[start:start + 4])
+            data_start = start + 4 + index_length
+            index = json.loads(self.bundle[start + 4:data_start].decode('utf-8'))
+            self.bytes_read += data_start
+            self.index = {name: (data_start + offset, length) for name, (offset, length) in index.items()}
+        except Exception as e:
+            print(f"Error opening asset bundle: {e}")
+            self.bundle = None
+            self.index = {}
+
+    def read_bytes(self, name):
+        """Raw bytes of an asset, or None if it can't be found"""
+        with self.lock:
+            self._open_bundle()
+            if name in self.index:
+                offset, length = self.index[name]
+                data = self.bundle[offset:offset + length]
+            else:
+                path = resource_path(name)
+                if not os.path.exists(path):
+                    return None
+                with open(path, 'rb') as f:
+                    data = f.read()
+            self.bytes_read += len(data)
+            return data
+
+    def get_image(self, name):
+        """Decoded RGBA image, decoded once"""
+        if name not in self.images:
+            data = self.read_bytes(name)
+            if data is None:
+                print(f"Asset not found: {name}")
+                self.images[name] = None
+                return None
+            started = time.perf_counter()
+            image = Image.open(io.BytesIO(data))
+            # .ico files hold several sizes; take the largest
+            if getattr(image, 'ico', None) is not None:
+                image.size = max(image.ico.sizes())
+            image = image.convert('RGBA')
+            self.decode_time[name] = time.perf_counter() - started
+            self.images[name] = image
+        return self.images[name]
+
+    def get_badge(self, size):
+        """The disabled badge pre-rendered at size x size"""
+        if size not in self.badges:
+            badge = self.get_image("disabled.ico")
+            if badge is not None:
+                started = time.perf_counter()
+                badge = badge.resize((size, size), Image.Resampling.LANCZOS)
+                self.decode_time[f"disabled.ico@{size}"] = time.perf_counter() - started
+            self.badges[size] = badge
+        return self.badges[size]
+
+    def prerender_badges(self, sizes):
+        for size in sizes:
+            self.get_badge(size)
+
+    def get_photo(self, name):
+        """Tk PhotoImage of an asset shared by every window (call from the Tk thread)"""
+        if name not in self.photos:
+            from PIL import ImageTk
+            image = self.get_image(name)
+            self.photos[name] = ImageTk.PhotoImage(image) if image is not None else None
+        return self.photos[name]
+
+    def report(self):
+        """Bytes read and decode/resize time (ms) so far"""
+        return {
+            'bundle': self.bundle_path if self.bundle is not None else None,
+            'bytes_read': self.bytes_read,
+            'decode_ms': {name: round(t * 1000, 3) for name, t in self.decode_time.items()},
+        }
+
+
+_registry = None
+
+
+def get_registry():
+    """The registry shared by the overlay and settings windows"""
+    global _registry
+    if _registry is None:
+        _registry = AssetRegistry()
+    return _registry
+
+
+if __name__ == '__main__':
+    # python assets.py -> build assets.pak from the loose files
+    index = build_bundle(BUNDLED_FILES, BUNDLE_NAME)
+    print(f"Wrote {BUNDLE_NAME}: " + ", ".join(f"{name} ({length} bytes)" for name, (_, length) in index.items()))
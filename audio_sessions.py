@@ -0,0 +1,436 @@
+import re
+import sys
+import math
+import contextlib
+import threading
+import itertools
+import psutil
+from app_targets import get_target
+import profiler_capture
+import trace_recorder
+
+# pycaw/comtypes only exist on Windows; the fake backend is used everywhere else
+try:
+    import comtypes
+    from pycaw.pycaw import AudioUtilities
+    from pycaw.callbacks import AudioSessionEvents, AudioSessionNotification
+except ImportError:
+    comtypes = None
+    AudioUtilities = None
+    AudioSessionEvents = object
+    AudioSessionNotification = object
+
+# Volume step used by 'step' commands that don't give an amount
+DEFAULT_STEP = 5
+
+
+class PycawSession:
+    """Wraps a pycaw AudioSession with the small interface the batch layer uses"""
+    def __init__(self, session):
+        self._session = session
+        self._volume = session.SimpleAudioVolume
+        self.pid = session.ProcessId
+        self.name = session.Process.name()
+
+    def get_volume(self):
+        return self._volume.GetMasterVolume()
+
+    def set_volume(self, level):
+        self._volume.SetMasterVolume(level, None)
+
+    def get_mute(self):
+        return bool(self._volume.GetMute())
+
+    def set_mute(self, muted):
+        self._volume.SetMute(1 if muted else 0, None)
+
+
+class SessionEventForwarder(AudioSessionEvents):
+    """Forwards one session's volume/mute notifications to the backend's listener"""
+    def __init__(self, session, backend):
+        super().__init__()
+        self.pid = session.pid
+        self.name = session.name
+        self.backend = backend
+
+    def on_simple_volume_changed(self, new_volume, new_mute, event_context):
+        self.backend.listener.session_changed(self.pid, self.name, new_volume, bool(new_mute))
+
+    def on_session_disconnected(self, disconnect_reason, disconnect_reason_id):
+        self.backend.session_gone(self.pid)
+
+    def on_state_changed(self, new_state, new_state_id):
+        if new_state == "Expired":
+            self.backend.session_gone(self.pid)
+
+
+class SessionCreatedForwarder(AudioSessionNotification):
+    """Hands sessions created after the backend started listening to the backend"""
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+
+    def on_session_created(self, new_session):
+        self.backend.session_created(new_session)
+
+
+class PycawBackend:
+    """Audio sessions from the Windows audio session API"""
+    def __init__(self):
+        self.listener = None
+        self._lock = threading.Lock()
+        # pid -> (PycawSession, forwarder); keeps registered sessions alive
+        self.watched = {}
+        # Session manager and its creation callback, kept alive while listening
+        self.session_manager = None
+        self.created_forwarder = None
+
+    def init_thread(self):
+        """Initialise COM for the calling thread.
+
+        Session notifications arrive on the audio service's threads, which
+        needs a multithreaded apartment.
+        """
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+
+    def watch_sessions(self, listener):
+        """Send volume/mute changes of every current and future session to listener"""
+        self.listener = listener
+        try:
+            self.session_manager = AudioUtilities.GetAudioSessionManager()
+            if self.session_manager is None:
+                return
+            self.created_forwarder = SessionCreatedForwarder(self)
+            self.session_manager.RegisterSessionNotification(self.created_forwarder)
+            # OnSessionCreated only starts firing once the manager has been enumerated
+            self.session_manager.GetSessionEnumerator()
+        except Exception as e:
+            print(f"Error watching for new audio sessions: {e}")
+
+    def session_created(self, session):
+        """Start watching a session the manager reported as new"""
+        if session.Process is None:
+            return
+        try:
+            wrapped = PycawSession(session)
+        except Exception as e:
+            print(f"Error reading audio session: {e}")
+            return
+        self._watch(session, wrapped)
+
+    def enumerate_sessions(self):
+        sessions = []
+        for session in AudioUtilities.GetAllSessions():
+            # System sounds has no process attached
+            if session.Process is None:
+                continue
+            try:
+                wrapped = PycawSession(session)
+            except Exception as e:
+                print(f"Error reading audio session: {e}")
+                continue
+            sessions.append(wrapped)
+            if self.listener is not None:
+                self._watch(session, wrapped)
+        return sessions
+
+    def watched_sessions(self):
+        """pid -> session for every session with a registered notification"""
+        with self._lock:
+            return {pid: entry[0] for pid, entry in self.watched.items() if entry is not None}
+
+    def session_gone(self, pid):
+        with self._lock:
+            watched = self.watched.pop(pid, None)
+        # Unregistering from inside a session callback deadlocks, so just let go of it
+        if watched is not None:
+            self.listener.session_removed(pid)
+
+    def _watch(self, session, wrapped):
+        # Enumerations and creation callbacks run on different threads; only one registers
+        with self._lock:
+            if wrapped.pid in self.watched:
+                return
+            self.watched[wrapped.pid] = None
+        try:
+            forwarder = SessionEventForwarder(wrapped, self)
+            session.register_notification(forwarder)
+            self.watched[wrapped.pid] = (wrapped, forwarder)
+            self.listener.session_changed(wrapped.pid, wrapped.name, wrapped.get_volume(), wrapped.get_mute())
+        except Exception as e:
+            with self._lock:
+                self.watched.pop(wrapped.pid, None)
+            print(f"Error watching audio session: {e}")
+
+    def get_focused_app(self):
+        import win32gui
+        import win32process
+        try:
+            hwnd = win32gui.GetForegroundWindow()
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            return psutil.Process(pid).name()
+        except Exception as e:
+            print(f"Error getting focused app: {e}")
+            return None
+
+
+class FakeSession:
+    """In-memory audio session used by the fake backend"""
+    def __init__(self, name, pid, volume=1.0, muted=False, backend=None):
+        self.name = name
+        self.pid = pid
+        self.volume = volume
+        self.muted = muted
+        self.backend = backend
+        # Number of level/mute reads, so callers can check the hot path skips them
+        self.reads = 0
+
+    def get_volume(self):
+        self.reads += 1
+        return self.volume
+
+    def set_volume(self, level):
+        self.volume = level
+        self._notify()
+
+    def get_mute(self):
+        self.reads += 1
+        return self.muted
+
+    def set_mute(self, muted):
+        self.muted = bool(muted)
+        self._notify()
+
+    def _notify(self):
+        # Like the real API, every change is published, including our own
+        if self.backend is not None and self.backend.listener is not None:
+            self.backend.listener.session_changed(self.pid, self.name, self.volume, self.muted)
+
+
+class FakeAudioBackend:
+    """Scriptable audio backend for running and testing on Linux"""
+    def __init__(self, sessions=None, focused_app=None):
+        self._lock = threading.Lock()
+        self._pids = itertools.count(1000)
+        self.sessions = []
+        self.focused_app = focused_app
+        self.listener = None
+        # Number of enumerations, so callers can check batches use one pass
+        self.enumerations = 0
+        for name, volume, muted in sessions or []:
+            self.add_session(name, volume=volume, muted=muted)
+
+    def init_thread(self):
+        pass
+
+    def watch_sessions(self, listener):
+        self.listener = listener
+
+    def add_session(self, name, pid=None, volume=1.0, muted=False):
+        with self._lock:
+            session = FakeSession(name, pid if pid is not None else next(self._pids), volume, muted, self)
+            self.sessions.append(session)
+        if self.listener is not None:
+            self.listener.session_changed(session.pid, name, volume, muted)
+        return session
+
+    def remove_session(self, pid):
+        with self._lock:
+            self.sessions = [s for s in self.sessions if s.pid != pid]
+        if self.listener is not None:
+            self.listener.session_removed(pid)
+
+    def watched_sessions(self):
+        # Every session is watched once a listener is set
+        if self.listener is None:
+            return {}
+        with self._lock:
+            return {session.pid: session for session in self.sessions}
+
+    def enumerate_sessions(self):
+        with self._lock:
+            self.enumerations += 1
+            return list(self.sessions)
+
+    def get_focused_app(self):
+        return self.focused_app
+
+
+def create_backend(fake=False):
+    """Pick the real backend on Windows and the fake one everywhere else"""
+    if fake or AudioUtilities is None or sys.platform != 'win32':
+        return FakeAudioBackend()
+    return PycawBackend()
+
+
+def index_sessions(sessions):
+    """Group sessions by lower-cased process name"""
+    by_name = {}
+    for session in sessions:
+        by_name.setdefault(session.name.lower(), []).append(session)
+    return by_name
+
+
+def aggregate_level(sessions):
+    """Level reported for a group of sessions: the loudest one"""
+    return max(session.get_volume() for session in sessions)
+
+
+def session_state(app_name, sessions):
+    """Return the reported state for a group of sessions"""
+    return {
+        'app': app_name,
+        'volume': round(aggregate_level(sessions) * 100),
+        # The app is only silent if every one of its sessions is muted
+        'muted': all(session.get_mute() for session in sessions),
+        'sessions': len(sessions),
+    }
+
+
+def clamp(level):
+    return max(0.0, min(1.0, level))
+
+
+def finite(value):
+    """float(value), refusing NaN and infinity (clamp(nan) would be 1.0)"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"not a finite number: {value}")
+    return number
+
+
+def apply_command(command, by_name, backend, state_store=None):
+    """Apply one command against an already enumerated session index.
+
+    With a state_store, steps and mute toggles start from the cached state
+    instead of reading the sessions first.
+    """
+    op = command.get('op')
+    app_name = command.get('app')
+
+    if op == 'query' and not app_name:
+        return [session_state(sessions[0].name, sessions) for sessions in by_name.values()]
+
+    if app_name == 'focused':
+        app_name = backend.get_focused_app()
+        if not app_name:
+            return {'app': 'focused', 'error': 'No focused application'}
+
+    # Fan out to every session of every process the target matches
+    sessions = get_target(app_name).filter_sessions(by_name) if app_name else None
+    if not sessions:
+        return {'app': app_name, 'error': f'No audio source detected for {app_name}'}
+
+    if op == 'set':
+        level = clamp(finite(command['volume']) / 100)
+        for session in sessions:
+            session.set_volume(level)
+    elif op == 'step':
+        delta = finite(command.get('delta', DEFAULT_STEP)) / 100
+        cached = state_store.get_sessions_state(sessions) if state_store else None
+        current = cached[0] if cached else aggregate_level(sessions)
+        level = clamp(current + delta)
+        for session in sessions:
+            session.set_volume(level)
+    elif op in ('mute', 'unmute', 'toggle_mute'):
+        if op == 'toggle_mute':
+            cached = state_store.get_sessions_state(sessions) if state_store else None
+            muted = not (cached[1] if cached else all(session.get_mute() for session in sessions))
+        else:
+            muted = op == 'mute'
+        for session in sessions:
+            session.set_mute(muted)
+    elif op != 'query':
+        return {'app': app_name, 'error': f'Unknown command: {op}'}
+
+    if state_store is not None:
+        # Write through so a burst of steps never reads a stale cached level
+        if op in ('set', 'step'):
+            state_store.set_sessions(sessions, volume=level)
+        elif op != 'query':
+            state_store.set_sessions(sessions, muted=muted)
+        cached = state_store.get_sessions_state(sessions)
+        if cached:
+            return {'app': app_name, 'volume': round(cached[0] * 100),
+                    'muted': cached[1], 'sessions': len(sessions)}
+    return session_state(app_name, sessions)
+
+
+def tracked_index(backend, commands, state_store):
+    """Session index built from the sessions the store already tracks, or None.
+
+    None means a command needs an enumeration: it lists every app, follows
+    the focus, or targets an app with no tracked session (it may have just
+    started, or the target is invalid and the batch should report it).
+    """
+    if state_store is None:
+        return None
+    watched = backend.watched_sessions()
+    by_name = index_sessions(watched[pid] for pid in state_store.tracked_pids() if pid in watched)
+    for command in commands:
+        app_name = command.get('app')
+        if not isinstance(app_name, str) or app_name == 'focused':
+            return None
+        try:
+            if not get_target(app_name).filter_sessions(by_name):
+                return None
+        except re.error:
+            return None
+    return by_name
+
+
+def apply_batch(backend, commands, state_store=None):
+    """Apply a list of commands using at most one session enumeration.
+
+    With a state_store, batches whose targets all have tracked sessions skip
+    the enumeration. Returns the per-command results and the (app_name, volume_percent) pair the
+    overlay should show for the batch, or None if nothing changed. The overlay
+    pair follows VolumeOverlay.show: 0 for muted and -1 for a missing source.
+    """
+    by_name = tracked_index(backend, commands, state_store)
+    if by_name is None:
+        by_name = index_sessions(backend.enumerate_sessions())
+    results = []
+    overlay_state = None
+    # The store delivers the batch's state changes together once it is applied
+    with state_store.batch() if state_store is not None else contextlib.nullcontext():
+        for command in commands:
+            try:
+                result = apply_command(command, by_name, backend, state_store)
+            except (AttributeError, KeyError, TypeError, ValueError, re.error) as e:
+                result = {'app': command.get('app'), 'error': f'Invalid command: {e}'}
+            results.append(result)
+
+            # Only changes are shown on the overlay, the last one wins
+            if command.get('op') == 'query' or isinstance(result, list):
+                continue
+            if 'error' in result:
+                overlay_state = (result['app'], -1)
+            elif result['muted']:
+                overlay_state = (result['app'], 0)
+            else:
+                overlay_state = (result['app'], result['volume'] / 100)
+    return results, overlay_state
+
+
+# Hotkey actions from settings.json ('brave_up' -> 'up') as batch commands
+HOTKEY_ACTIONS = {
+    'up': {'op': 'step', 'delta': DEFAULT_STEP},
+    'down': {'op': 'step', 'delta': -DEFAULT_STEP},
+    'mute': {'op': 'toggle_mute'},
+}
+
+
+def apply_hotkey(backend, app_name, action, state_store=None):
+    """Apply one hotkey press and return the overlay (app_name, volume_percent) pair"""
+    profiler_capture.record_event('hotkey')
+    # Resolve the focused app first so a replay sees the focus change before the press
+    if app_name == 'focused':
+        focused = backend.get_focused_app()
+        if focused:
+            trace_recorder.record('focus', app=focused)
+            app_name = focused
+    trace_recorder.record('hotkey', app=app_name, action=action)
+    command = dict(HOTKEY_ACTIONS[action], app=app_name)
+    _, overlay_state = apply_batch(backend, [command], state_store)
+    return overlay_state
@@ -0,0 +1,77 @@
+"""Compare overlay render latency of the widget and image renderers"""
+import argparse
+import statistics
+import time
+import tkinter as tk
+from PIL import Image
+from overlay_renderer import ImageRenderer
+
+
+def make_icon(size=48):
+    """Synthetic icon with soft alpha edges"""
+    icon = Image.new('RGBA', (size, size))
+    icon.putdata([(x * 5 % 256, y * 5 % 256, 160, 255 if 4 < x < size - 4 else 128)
+                  for y in range(size) for x in range(size)])
+    return icon
+
+
+def summarise(name, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<22} mean {statistics.mean(samples) * 1000:7.3f} ms   "
+          f"p50 {statistics.median(samples) * 1000:7.3f} ms   p95 {p95 * 1000:7.3f} ms")
+
+
+def bench_compose(icon, iterations):
+    """Composition only, no window; runs anywhere Pillow does"""
+    renderer = ImageRenderer()
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        renderer.render(icon, (i % 101) / 100)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_overlay(renderer, icon, iterations):
+    """Full update of a visible VolumeOverlay, including Tk layout and drawing"""
+    from overlay import VolumeOverlay
+
+    overlay = VolumeOverlay(renderer=renderer)
+    overlay.show_icon(icon)
+    overlay.present()
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        overlay.show_level((i % 101) / 100)
+        overlay.window.update_idletasks()
+        samples.append(time.perf_counter() - started)
+    overlay.destroy()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    icon = make_icon()
+    summarise("image compose", bench_compose(icon, args.iterations))
+
+    # The overlay itself needs the Windows modules
+    try:
+        from icons import enable_dpi_awareness
+        enable_dpi_awareness()
+        root = tk.Tk()
+        root.withdraw()
+        for renderer in ('widgets', 'image'):
+            summarise(f"{renderer} overlay", bench_overlay(renderer, icon, args.iterations))
+        root.destroy()
+    except ImportError as e:
+        print(f"Skipping overlay benchmarks: {e}")
+    except tk.TclError as e:
+        print(f"Skipping overlay benchmarks, no display: {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import json
+import socket
+import sys
+from control_server import DEFAULT_HOST, DEFAULT_PORT, parse_text_command
+
+
+def send_commands(commands, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5):
+    """Send one batch of commands to the running instance and return the response"""
+    request = json.dumps({'commands': commands}) + '\n'
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(request.encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as f:
+            line = f.readline()
+    if not line.strip():
+        raise ConnectionError("The volume changer closed the connection without replying")
+    try:
+        response = json.loads(line)
+    except ValueError:
+        raise ValueError(f"Invalid reply from the volume changer: {line.strip()!r}") from None
+    if not isinstance(response, dict):
+        raise ValueError(f"Invalid reply from the volume changer: {line.strip()!r}")
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Send batched volume commands to Luwe's Volume Changer",
+        epilog="Example: control_client.py \"set discord.exe 35\" \"mute brave.exe\" "
+               "\"step focused -10\" query")
+    parser.add_argument('commands', nargs='+',
+                        help="set APP PERCENT | step APP DELTA | mute APP | unmute APP | "
+                             "toggle_mute APP | query [APP] | profile SECONDS | record SECONDS | stop_recording")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    try:
+        commands = [parse_text_command(text) for text in args.commands]
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        response = send_commands(commands, args.host, args.port)
+    except OSError as e:
+        print(f"Could not reach the volume changer: {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(json.dumps(response, indent=4))
+    return 0 if response.get('ok') else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
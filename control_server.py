@@ -0,0 +1,236 @@
+import asyncio
+import json
+import math
+import threading
+import argparse
+from audio_sessions import apply_batch, create_backend
+from process_watcher import snapshot_processes
+from volume_state import VolumeStateStore
+import profiler_capture
+import trace_recorder
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 48765
+
+# Number of arguments each text command takes after the op
+TEXT_COMMANDS = {
+    'set': ('app', 'volume'),
+    'step': ('app', 'delta'),
+    'mute': ('app',),
+    'unmute': ('app',),
+    'toggle_mute': ('app',),
+    'query': (),
+    'profile': ('seconds',),
+    'record': ('seconds',),
+    'stop_recording': (),
+}
+
+# Commands that start a capture instead of changing the audio
+DIAGNOSTIC_OPS = ('profile', 'record', 'stop_recording')
+# Longest capture a request may ask for, in seconds
+MAX_DIAGNOSTIC_SECONDS = 300
+
+
+def parse_text_command(text):
+    """Parse a command like 'set discord.exe 35' into a command dict"""
+    parts = text.split()
+    if not parts:
+        raise ValueError("Empty command")
+    op = parts[0].lower()
+    if op not in TEXT_COMMANDS:
+        raise ValueError(f"Unknown command: {op}")
+    fields = TEXT_COMMANDS[op]
+    args = parts[1:]
+    # 'query' may optionally name one app
+    if op == 'query' and len(args) == 1:
+        return {'op': op, 'app': args[0]}
+    if len(args) != len(fields):
+        raise ValueError(f"'{op}' expects {len(fields)} argument(s)")
+    command = {'op': op}
+    for field, value in zip(fields, args):
+        if field in ('volume', 'delta', 'seconds'):
+            value = float(value)
+            # float() also accepts 'nan' and 'inf'
+            if not math.isfinite(value):
+                raise ValueError(f"'{field}' must be a finite number")
+        command[field] = value
+    return command
+
+
+def parse_request(line):
+    """Parse one request line into a list of commands.
+
+    A line is either JSON ({"commands": [...]} or a bare list) or text
+    commands separated by ';', e.g. 'set discord.exe 35; mute brave.exe'.
+    """
+    line = line.strip()
+    if line.startswith('{') or line.startswith('['):
+        request = json.loads(line)
+        commands = request.get('commands', []) if isinstance(request, dict) else request
+        if not isinstance(commands, list) or not all(isinstance(c, dict) for c in commands):
+            raise ValueError("'commands' must be a list of objects")
+        for command in commands:
+            if not isinstance(command.get('op'), str):
+                raise ValueError("Every command needs a string 'op'")
+            if command.get('app') is not None and not isinstance(command['app'], str):
+                raise ValueError("'app' must be a string")
+        return commands
+    return [parse_text_command(part) for part in line.split(';') if part.strip()]
+
+
+class ControlServer:
+    """Local control endpoint for scripts, running on its own asyncio thread.
+
+    Each request line is applied as one batch against the audio backend and
+    answered with one JSON line. on_batch_applied(app_name, volume_percent) is
+    called once per batch that changed something and is called from the server
+    thread, so Tk callers should hand it over with after(), e.g.
+    lambda app, volume: root.after(0, overlay.show, app, volume)
+    """
+    def __init__(self, backend, on_batch_applied=None, host=DEFAULT_HOST, port=DEFAULT_PORT, state_store=None,
+                 tk_widget=None):
+        self.backend = backend
+        self.state_store = state_store
+        # Lets profile captures include a pstats file for the Tk thread
+        self.tk_widget = tk_widget
+        self.on_batch_applied = on_batch_applied
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+
+    def start(self):
+        """Start serving in a daemon thread and wait until it is listening"""
+        self.thread = threading.Thread(target=self._run, name="control-server", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        return self
+
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def _run(self):
+        self.backend.init_thread()
+        # Session notifications are registered from this thread's COM apartment
+        if self.state_store is not None:
+            self.state_store.track(self.backend)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port))
+            # Pick up the real port when started with port 0
+            self.port = self.server.sockets[0].getsockname()[1]
+        except Exception as e:
+            print(f"Error starting control server: {e}")
+            self.ready.set()
+            return
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    response = self.handle_line(line.decode('utf-8'))
+                except Exception as e:
+                    # Always answer, so the client never waits on a closed connection
+                    print(f"Error handling control request: {e}")
+                    response = {'ok': False, 'error': f'Internal error: {e}'}
+                writer.write((json.dumps(response) + '\n').encode('utf-8'))
+                await writer.drain()
+                # Anything that isn't our protocol (e.g. a browser's HTTP request
+                # carrying commands in its body) gets no second line
+                if not response['ok']:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def handle_line(self, line):
+        """Apply one request line and return the response object"""
+        try:
+            commands = parse_request(line)
+        except ValueError as e:
+            return {'ok': False, 'error': str(e)}
+
+        # Diagnostics start alongside the batch; the rest is applied as usual
+        audio_commands = [c for c in commands if c['op'] not in DIAGNOSTIC_OPS]
+        diagnostics = iter([self.start_diagnostics(c) for c in commands if c['op'] in DIAGNOSTIC_OPS])
+
+        audio_results = iter([])
+        if audio_commands:
+            profiler_capture.record_event('control_batch')
+            results, overlay_state = apply_batch(self.backend, audio_commands, self.state_store)
+            audio_results = iter(results)
+            if overlay_state is not None and self.on_batch_applied is not None:
+                try:
+                    self.on_batch_applied(*overlay_state)
+                except Exception as e:
+                    print(f"Error updating overlay: {e}")
+
+        # Answer in the order the commands were sent
+        results = [next(diagnostics) if c['op'] in DIAGNOSTIC_OPS else next(audio_results) for c in commands]
+        return {'ok': True, 'results': results}
+
+    def start_diagnostics(self, command):
+        if command['op'] == 'stop_recording':
+            trace_path = trace_recorder.stop_recording()
+            if trace_path is None:
+                return {'error': 'No trace recording is running'}
+            return {'trace': trace_path}
+        try:
+            seconds = float(command.get('seconds', 10))
+            # JSON requests can still carry NaN or Infinity here
+            if not 0 < seconds <= MAX_DIAGNOSTIC_SECONDS:
+                raise ValueError(f"'seconds' must be more than 0 and at most {MAX_DIAGNOSTIC_SECONDS}")
+            if command['op'] == 'record':
+                # Replays start from the sessions, processes and focus that exist right now
+                snapshot = trace_recorder.capture_snapshot(self.backend, snapshot_processes)
+                return {'trace': trace_recorder.record_for(seconds, snapshot=snapshot)}
+            return {'profile': profiler_capture.start_capture(seconds, tk_widget=self.tk_widget)}
+        except (RuntimeError, OSError, TypeError, ValueError) as e:
+            return {'error': str(e)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the volume control server on its own")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--fake', action='store_true', help="use the fake audio backend")
+    args = parser.parse_args()
+
+    backend = create_backend(fake=args.fake)
+    if args.fake:
+        backend.add_session('brave.exe', volume=0.5)
+        backend.add_session('discord.exe', volume=0.8)
+        backend.focused_app = 'brave.exe'
+
+    state_store = VolumeStateStore()
+    server = ControlServer(backend, port=args.port, state_store=state_store,
+                           on_batch_applied=lambda app, volume: print(f"overlay: {app} {volume}"))
+    server.start()
+    print(f"Listening on {server.host}:{server.port}")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
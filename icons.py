@@ -0,0 +1,161 @@
+import ctypes
+from ctypes import wintypes
+from PIL import Image
+import win32gui
+import win32ui
+import win32con
+import win32api
+import win32print
+
+# Icon size at 100% scaling; the overlay has always shown 32px icons at 1.5x
+BASE_ICON_SIZE = 48
+BASE_DPI = 96
+
+# GetDpiForMonitor's MDT_EFFECTIVE_DPI
+MDT_EFFECTIVE_DPI = 0
+MONITOR_DEFAULTTONEAREST = 2
+
+# SetProcessDpiAwarenessContext's DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2,
+# and SetProcessDpiAwareness's PROCESS_PER_MONITOR_DPI_AWARE for older systems
+DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2 = -4
+PROCESS_PER_MONITOR_DPI_AWARE = 2
+
+# Messages after which cached monitor DPIs may be stale
+WM_DISPLAYCHANGE = 0x007E
+WM_SETTINGCHANGE = 0x001A
+WM_DPICHANGED = 0x02E0
+
+_monitor_dpi = {}
+
+# hwnd -> (previous window procedure, our procedure) for windows watching
+# display changes; holding ours keeps it alive while Windows calls it
+_display_hooks = {}
+
+
+def enable_dpi_awareness():
+    """Make the process per-monitor DPI aware. Call before creating any window.
+
+    An unaware process is told every monitor is 96 DPI and has its windows
+    bitmap-stretched, so the overlay would never pick larger icons.
+    """
+    user32 = ctypes.windll.user32
+    try:
+        # Windows 10 1703+
+        user32.SetProcessDpiAwarenessContext.argtypes = [wintypes.HANDLE]
+        user32.SetProcessDpiAwarenessContext.restype = wintypes.BOOL
+        if user32.SetProcessDpiAwarenessContext(DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2):
+            return True
+    except AttributeError:
+        pass
+    try:
+        # Windows 8.1+; fails if the awareness was already set, e.g. by the manifest
+        return ctypes.windll.shcore.SetProcessDpiAwareness(PROCESS_PER_MONITOR_DPI_AWARE) == 0
+    except (AttributeError, OSError):
+        return bool(user32.SetProcessDPIAware())
+
+
+def get_monitor_dpi(x, y):
+    """Effective DPI of the monitor containing a screen point, cached per monitor"""
+    try:
+        monitor = win32api.MonitorFromPoint((x, y), MONITOR_DEFAULTTONEAREST)
+        handle = int(monitor)
+    except Exception as e:
+        print(f"Error finding monitor: {e}")
+        return BASE_DPI
+
+    if handle not in _monitor_dpi:
+        dpi_x = ctypes.c_uint()
+        dpi_y = ctypes.c_uint()
+        try:
+            # shcore is Windows 8.1+, older systems get the system DPI
+            result = ctypes.windll.shcore.GetDpiForMonitor(
+                wintypes.HMONITOR(handle), MDT_EFFECTIVE_DPI,
+                ctypes.byref(dpi_x), ctypes.byref(dpi_y))
+            _monitor_dpi[handle] = dpi_x.value if result == 0 else BASE_DPI
+        except (AttributeError, OSError):
+            hdc = win32gui.GetDC(0)
+            _monitor_dpi[handle] = win32print.GetDeviceCaps(hdc, win32con.LOGPIXELSX)
+            win32gui.ReleaseDC(0, hdc)
+    return _monitor_dpi[handle]
+
+
+def forget_monitor_dpi():
+    """Drop cached DPI values, e.g. after a display settings change"""
+    _monitor_dpi.clear()
+
+
+def watch_display_changes(hwnd):
+    """Forget cached monitor DPIs when the display layout or scaling changes.
+
+    Subclasses the window procedure of hwnd, a top-level window, since Tk
+    does not expose WM_DISPLAYCHANGE or WM_DPICHANGED.
+    """
+    if hwnd in _display_hooks:
+        return
+
+    def window_proc(hwnd, msg, wparam, lparam):
+        if msg in (WM_DISPLAYCHANGE, WM_SETTINGCHANGE, WM_DPICHANGED):
+            forget_monitor_dpi()
+        return win32gui.CallWindowProc(_display_hooks[hwnd][0], hwnd, msg, wparam, lparam)
+
+    previous = win32gui.SetWindowLong(hwnd, win32con.GWL_WNDPROC, window_proc)
+    _display_hooks[hwnd] = (previous, window_proc)
+
+
+def icon_size_for_dpi(dpi):
+    """Pixel size of an overlay icon at the given DPI"""
+    return max(16, round(BASE_ICON_SIZE * dpi / BASE_DPI))
+
+
+def _extract_hicon(exe_path, size):
+    """Extract the exe's main icon as an HICON of exactly size x size.
+
+    PrivateExtractIcons picks the best native image in the file (16 up to
+    256px) and only scales when no exact match exists, unlike ExtractIconEx
+    which always returns the 32px large icon.
+    """
+    hicon = wintypes.HICON()
+    icon_id = wintypes.UINT()
+    count = ctypes.windll.user32.PrivateExtractIconsW(
+        exe_path, 0, size, size, ctypes.byref(hicon), ctypes.byref(icon_id), 1, 0)
+    if count == 1 and hicon.value:
+        return hicon.value
+
+    # Fall back to the large icon; DrawIconEx stretches it to size
+    large, small = win32gui.ExtractIconEx(exe_path, 0, 1)
+    for icon in small:
+        win32gui.DestroyIcon(icon)
+    return large[0] if large else None
+
+
+def extract_icon(exe_path, size):
+    """Return the exe's icon as a size x size RGBA image, or None"""
+    hicon = _extract_hicon(exe_path, size)
+    if not hicon:
+        return None
+
+    try:
+        screen_dc = win32gui.GetDC(0)
+        mem_dc = None
+        hbmp = None
+        try:
+            hdc = win32ui.CreateDCFromHandle(screen_dc)
+            hbmp = win32ui.CreateBitmap()
+            hbmp.CreateCompatibleBitmap(hdc, size, size)
+            mem_dc = hdc.CreateCompatibleDC()
+            mem_dc.SelectObject(hbmp)
+            win32gui.DrawIconEx(mem_dc.GetSafeHdc(), 0, 0, hicon, size, size, 0, None, win32con.DI_NORMAL)
+
+            bmpstr = hbmp.GetBitmapBits(True)
+            img = Image.frombuffer('RGBA', (size, size), bmpstr, 'raw', 'BGRA', 0, 1)
+            # frombuffer shares the bitmap bytes, copy so the image owns its data
+            return img.copy()
+        finally:
+            # Release the GDI objects even when drawing or reading the bits fails
+            if mem_dc is not None:
+                mem_dc.DeleteDC()
+            if hbmp is not None and hbmp.GetHandle():
+                win32gui.DeleteObject(hbmp.GetHandle())
+            win32gui.ReleaseDC(0, screen_dc)
+    finally:
+        win32gui.DestroyIcon(hicon)
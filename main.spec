@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('image.ico', '.'), ('disabled.ico', '.')],
+    datas=[('assets.pak', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
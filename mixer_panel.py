@@ -0,0 +1,255 @@
+import tkinter as tk
+from PIL import ImageTk
+import profiler_capture
+from app_targets import get_target
+from audio_sessions import index_sessions, session_state
+
+BG_COLOR = '#2b2b2b'
+FG_COLOR = '#ffffff'
+MUTED_FG = '#808080'
+TRACK_COLOR = '#0f0f0f'
+BAR_COLOR = '#ffffff'
+BAR_WIDTH = 160
+
+
+class MixerRow:
+    """One recyclable row: icon, app name, level bar and mute state"""
+    def __init__(self, parent, panel):
+        self.panel = panel
+        self.app_name = None
+        self.frame = tk.Frame(parent, bg=BG_COLOR, pady=4)
+
+        # A Label without an image measures width/height in characters, so the
+        # icon sits in a frame of fixed pixel size instead
+        icon_frame = tk.Frame(self.frame, bg=BG_COLOR, width=panel.icon_size, height=panel.icon_size)
+        icon_frame.pack_propagate(False)
+        icon_frame.pack(side=tk.LEFT, padx=(0, 10))
+        self.icon_label = tk.Label(icon_frame, bg=BG_COLOR, borderwidth=0)
+        self.icon_label.pack(expand=True)
+
+        self.name_label = tk.Label(self.frame, bg=BG_COLOR, fg=FG_COLOR,
+                                   font=('Segoe UI', 11), width=18, anchor='w')
+        self.name_label.pack(side=tk.LEFT)
+
+        self.percent_label = tk.Label(self.frame, bg=BG_COLOR, fg=FG_COLOR,
+                                      font=('Segoe UI', 11, 'bold'), width=6, anchor='e')
+        self.percent_label.pack(side=tk.RIGHT)
+
+        # The bar's rectangles are created once and only moved afterwards
+        self.bar = tk.Canvas(self.frame, width=BAR_WIDTH, height=4, bg=BG_COLOR, highlightthickness=0)
+        self.bar.pack(side=tk.RIGHT, padx=10)
+        self.bar.create_rectangle(0, 0, BAR_WIDTH, 4, fill=TRACK_COLOR, outline='')
+        self.level_rect = self.bar.create_rectangle(0, 0, 0, 4, fill=BAR_COLOR, outline='')
+
+        self.frame.pack(fill=tk.X)
+        self.shown_state = None
+
+    def bind(self, app_name, volume, muted):
+        """Point this row at an app, reconfiguring only what differs"""
+        if app_name != self.app_name:
+            self.app_name = app_name
+            self.name_label.configure(text=app_name)
+            self.shown_state = None
+        self.set_state(volume, muted)
+
+    def set_state(self, volume, muted):
+        if (volume, muted) == self.shown_state:
+            return
+        self.shown_state = (volume, muted)
+        photo = self.panel.get_photo(self.app_name, muted)
+        self.icon_label.configure(image=photo or '')
+        # Keep the photo alive while shown, even after the panel's cache drops it
+        self.icon_label.image = photo
+        self.bar.coords(self.level_rect, 0, 0, int(BAR_WIDTH * volume), 4)
+        self.bar.itemconfigure(self.level_rect, fill=MUTED_FG if muted else BAR_COLOR)
+        self.percent_label.configure(text="Muted" if muted else f"{int(volume * 100)}%",
+                                     fg=MUTED_FG if muted else FG_COLOR)
+
+    def clear(self):
+        self.app_name = None
+        self.shown_state = None
+        if self.frame.winfo_manager():
+            self.frame.pack_forget()
+
+    def ensure_packed(self):
+        if not self.frame.winfo_manager():
+            self.frame.pack(fill=tk.X)
+
+
+class MixerPanel:
+    """Panel listing every active audio session.
+
+    Sessions come from one enumeration when the panel opens. Only
+    visible_rows row widgets ever exist; scrolling rebinds them to other
+    sessions, so 50+ sessions cost the same widgets as 8. With a state store
+    attached, live level changes update just the row showing that app.
+    """
+    def __init__(self, overlay, backend, state_store=None, visible_rows=8, process_watcher=None):
+        self.overlay = overlay
+        self.backend = backend
+        self.visible_rows = visible_rows
+        self.sessions = []  # [app_name, volume, muted], sorted by name
+        self.offset = 0
+        # (app_name, muted) -> PhotoImage built from the overlay's icon cache
+        self.photos = {}
+        self.max_photos = visible_rows * 4
+        self.icon_size = overlay.icon_size()
+
+        self.window = tk.Toplevel()
+        self.window.overrideredirect(True)
+        self.window.attributes('-topmost', True)
+        self.window.configure(bg=BG_COLOR)
+        self.window.wm_attributes('-toolwindow', True)
+
+        title = tk.Label(self.window, text="Mixer", bg=BG_COLOR, fg=FG_COLOR, font=('Segoe UI', 10))
+        title.pack(anchor='w', padx=10, pady=(5, 0))
+
+        body = tk.Frame(self.window, bg=BG_COLOR, padx=10, pady=5)
+        body.pack(fill=tk.BOTH, expand=True)
+
+        self.scrollbar = tk.Scrollbar(body, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.rows_frame = tk.Frame(body, bg=BG_COLOR)
+        self.rows_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.rows = [MixerRow(self.rows_frame, self) for _ in range(visible_rows)]
+
+        self.window.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.window.bind('<Escape>', lambda e: self.hide())
+        self.window.withdraw()
+
+        if state_store is not None:
+            state_store.subscribe(self.handle_state_change)
+        self.process_watcher = process_watcher or overlay.process_watcher
+        if self.process_watcher is not None:
+            self.process_watcher.subscribe(self.handle_process_events)
+
+    def get_photo(self, app_name, muted):
+        key = (app_name, muted)
+        if key not in self.photos:
+            img, _ = self.overlay.get_app_icon(app_name, is_muted=muted, size=self.icon_size)
+            if img is None:
+                return None
+            if len(self.photos) >= self.max_photos:
+                # Remove oldest item
+                self.photos.pop(next(iter(self.photos)))
+            self.photos[key] = ImageTk.PhotoImage(img)
+        return self.photos[key]
+
+    def handle_process_events(self, events):
+        """Drop photos of apps that no longer have a running process"""
+        exited_names = {event.name for event in events if event.kind == 'exit'}
+        if not exited_names:
+            return
+        for key in list(self.photos):
+            target = get_target(key[0])
+            if not any(target.matches(name) for name in exited_names):
+                continue
+            if not self.process_watcher.is_running(key[0]):
+                del self.photos[key]
+
+    def is_visible(self):
+        return self.window.state() == 'normal'
+
+    def toggle(self):
+        if self.is_visible():
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        """Load every session in one enumeration and open the panel"""
+        try:
+            by_name = index_sessions(self.backend.enumerate_sessions())
+        except Exception as e:
+            print(f"Error listing audio sessions: {e}")
+            by_name = {}
+        self.sessions = []
+        for sessions in by_name.values():
+            state = session_state(sessions[0].name, sessions)
+            self.sessions.append([state['app'], state['volume'] / 100, state['muted']])
+        self.sessions.sort(key=lambda s: s[0].lower())
+        self.offset = 0
+        self.bind_rows()
+
+        self.window.update_idletasks()
+        x = (self.window.winfo_screenwidth() // 2) - (self.window.winfo_reqwidth() // 2)
+        y = (self.window.winfo_screenheight() // 2) - (self.window.winfo_reqheight() // 2)
+        self.window.geometry(f"+{x}+{y}")
+        self.window.deiconify()
+        self.window.focus_force()
+
+    def hide(self):
+        self.window.withdraw()
+
+    def scroll(self, rows):
+        max_offset = max(0, len(self.sessions) - self.visible_rows)
+        offset = max(0, min(max_offset, self.offset + rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.bind_rows()
+
+    def on_scrollbar(self, action, amount, units=None):
+        if action == 'moveto':
+            self.scroll(int(float(amount) * len(self.sessions)) - self.offset)
+        elif action == 'scroll':
+            step = self.visible_rows if units == 'pages' else 1
+            self.scroll(int(amount) * step)
+
+    def bind_rows(self):
+        """Rebind the fixed row pool to the sessions in view"""
+        for i, row in enumerate(self.rows):
+            index = self.offset + i
+            if index < len(self.sessions):
+                row.ensure_packed()
+                row.bind(*self.sessions[index])
+            else:
+                row.clear()
+        if self.sessions:
+            first = self.offset / len(self.sessions)
+            last = min(1.0, (self.offset + self.visible_rows) / len(self.sessions))
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def handle_state_change(self, app_name, volume, muted):
+        """Called from notification threads, so hand over to the Tk thread"""
+        self.window.after(0, self.apply_state_change, app_name, volume, muted)
+
+    def apply_state_change(self, app_name, volume, muted):
+        for index, session in enumerate(self.sessions):
+            if session[0].lower() == app_name.lower():
+                if volume is not None:
+                    session[1], session[2] = volume, muted
+                break
+        else:
+            # New sessions show up on the next open; the list order stays stable meanwhile
+            return
+
+        if volume is None:
+            # The app's last session is gone, so its row goes too
+            del self.sessions[index]
+            self.offset = max(0, min(self.offset, len(self.sessions) - self.visible_rows))
+            if self.is_visible():
+                self.bind_rows()
+            return
+
+        # Only the row currently showing this app is touched
+        row_index = index - self.offset
+        if self.is_visible() and 0 <= row_index < self.visible_rows:
+            self.rows[row_index].set_state(volume, muted)
+
+
+def register_mixer_hotkey(hotkey, panel):
+    """Bind the 'show mixer' hotkey; the keyboard hook thread hands over to Tk"""
+    import keyboard
+
+    def pressed():
+        profiler_capture.record_event('hotkey')
+        panel.window.after(0, panel.toggle)
+
+    try:
+        return keyboard.add_hotkey(hotkey, pressed)
+    except Exception as e:
+        print(f"Error binding mixer hotkey: {e}")
+        return None
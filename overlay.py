@@ -3,23 +3,18 @@ from PIL import Image, ImageTk
 import win32gui
 import win32process
 import psutil
-import os
-import sys
-import win32ui
-import win32con
-import win32api
-from functools import lru_cache
+from app_targets import get_target
+from assets import get_registry, resource_path  # resource_path kept importable from here
+from icons import BASE_DPI, extract_icon, get_monitor_dpi, icon_size_for_dpi, watch_display_changes
+import profiler_capture
+from overlay_renderer import ImageRenderer, LabelPresenter, compose_strip, create_presenter, points_to_pixels
 
-def resource_path(relative_path):
-    """Get absolute path to resource, works for dev and for PyInstaller"""
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+# Overlay size at 96 DPI; it grows with the monitor DPI like the icons do
+OVERLAY_WIDTH = 165
+OVERLAY_HEIGHT = 65
 
 class VolumeOverlay:
-    def __init__(self):
+    def __init__(self, scheduler=None, renderer='widgets'):
         # Create main volume change window
         self.window = tk.Toplevel()
         self.window.overrideredirect(True)
@@ -27,9 +22,127 @@ class VolumeOverlay:
         self.window.configure(bg='#2b2b2b')
         self.window.wm_attributes('-toolwindow', True)
         
-        # Set fixed width for the window
-        self.window.geometry("165x65")
+        # Screen position of the overlay; icons and layout are sized for this point's monitor
+        self.position = (10, 80)
+        self.scale = self.dpi_scale()
         
+        # 'widgets' builds the Tk widget tree, 'image' composes one image per update
+        self.renderer = renderer
+        self.image_renderer = None
+        self.current_icon = None
+        if renderer == 'image':
+            self.image_renderer = ImageRenderer(scale=self.scale)
+            self.presenter = create_presenter(self.window)
+        else:
+            self.build_widgets()
+        
+        # Hide initially
+        self.window.withdraw()
+        
+        # Rescale on the next show after the display layout or scaling changes
+        try:
+            self.window.update_idletasks()
+            watch_display_changes(int(self.window.wm_frame(), 16))
+        except Exception as e:
+            print(f"Error watching display changes: {e}")
+        
+        # Fade animation variables; timers go through the shared scheduler when given
+        self.scheduler = scheduler
+        self.fade_timer = None
+        self.alpha = 1.0
+        self.fade_duration = 300  # Duration in milliseconds
+        self.fade_steps = 30  # Number of steps for smoother fade
+        
+        # Icon cache with size limit
+        self.icon_cache = {}
+        self.max_cache_size = 20  # Limit cache to 20 icons
+        
+        # App name -> (pid, exe) of a matching process, kept current by the process watcher
+        self.process_index = {}
+        self.process_watcher = None
+        
+        # Optional VolumeStateStore that keeps the muted strip current
+        self.state_store = None
+        self.current_app = None
+        
+        # Shared asset registry; the disabled badge is decoded on first use
+        self.assets = get_registry()
+            
+        # Create muted apps window
+        self.muted_window = tk.Toplevel()
+        self.muted_window.overrideredirect(True)
+        self.muted_window.attributes('-topmost', True)
+        self.muted_window.configure(bg='#000000')
+        self.muted_window.wm_attributes('-toolwindow', True)
+        
+        # Dictionary to store muted app icons (labels, or images with the image renderer)
+        self.muted_apps = {}
+        self.muted_position = (5, 20)
+        
+        if self.image_renderer is not None:
+            # Per-pixel alpha gives clean icon edges without a colour key
+            self.muted_presenter = create_presenter(self.muted_window, bg='#000000')
+            if isinstance(self.muted_presenter, LabelPresenter):
+                self.muted_window.wm_attributes('-transparentcolor', '#000000')
+        else:
+            self.muted_window.wm_attributes('-transparentcolor', '#000000')
+            
+            # Create frame for muted apps
+            self.muted_frame = tk.Frame(self.muted_window, bg='#000000', padx=10, pady=5)
+            self.muted_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Position muted window
+        self.muted_window.geometry(f"+{self.muted_position[0]}+{self.muted_position[1]}")
+        
+        # Pre-render the disabled badge and percentages for this monitor once startup has settled
+        self.schedule(1000, self.prerender)
+
+    def prerender(self):
+        """Render the disabled badge and, with the image renderer, every percentage text"""
+        self.assets.prerender_badges([self.icon_size() // 2])
+        if self.image_renderer is not None:
+            self.image_renderer.prewarm()
+
+    def destroy(self):
+        """Close both windows and free the presenters' native surfaces"""
+        self.cancel_fade()
+        if self.image_renderer is not None:
+            self.presenter.destroy()
+            self.muted_presenter.destroy()
+        self.window.destroy()
+        self.muted_window.destroy()
+
+    def dpi_scale(self):
+        """Scale factor of the monitor the overlay is on, relative to 96 DPI"""
+        return get_monitor_dpi(*self.position) / BASE_DPI
+
+    def scaled(self, value):
+        return round(value * self.scale)
+
+    def update_scale(self):
+        """Resize the layout when the overlay's monitor has a different DPI"""
+        scale = self.dpi_scale()
+        if scale == self.scale:
+            return
+        self.scale = scale
+        if self.image_renderer is not None:
+            self.image_renderer = ImageRenderer(scale=scale)
+        else:
+            self.apply_widget_scale()
+
+    def apply_widget_scale(self):
+        """Size the widget tree and fonts for the current scale"""
+        self.level_font = ('Segoe UI', -self.scaled(points_to_pixels(20)), 'bold')
+        self.message_font = ('Segoe UI', -self.scaled(points_to_pixels(16)), 'bold')
+        self.window.geometry(f"{self.scaled(OVERLAY_WIDTH)}x{self.scaled(OVERLAY_HEIGHT)}")
+        self.frame.configure(padx=self.scaled(10))
+        self.left_frame.pack_configure(padx=(0, self.scaled(10)))
+        self.content_frame.pack_configure(pady=(self.scaled(5), self.scaled(2)))
+        self.progress_bar.configure(height=self.scaled(4))
+        self.volume_label.configure(font=self.level_font)
+
+    def build_widgets(self):
+        """Build the widget tree used by the 'widgets' renderer"""
         # Create main frame
         self.frame = tk.Frame(self.window, bg='#2b2b2b', padx=10, pady=0)
         self.frame.pack(fill=tk.BOTH, expand=True)
@@ -74,61 +187,16 @@ class VolumeOverlay:
                                     highlightthickness=0)
         self.progress_bar.pack(fill=tk.X)
         
-        # Hide initially
-        self.window.withdraw()
-        
-        # Fade animation variables
-        self.fade_timer = None
-        self.alpha = 1.0
-        self.fade_duration = 300  # Duration in milliseconds
-        self.fade_steps = 30  # Number of steps for smoother fade
-        
-        # Icon cache with size limit
-        self.icon_cache = {}
-        self.max_cache_size = 20  # Limit cache to 20 icons
-        
-        # Load disabled icon once
-        try:
-            self.disabled_icon = Image.open(resource_path("disabled.ico"))
-        except Exception as e:
-            print(f"Error loading disabled icon: {e}")
-            self.disabled_icon = None
-            
-        # Create muted apps window
-        self.muted_window = tk.Toplevel()
-        self.muted_window.overrideredirect(True)
-        self.muted_window.attributes('-topmost', True)
-        self.muted_window.configure(bg='#000000')
-        self.muted_window.wm_attributes('-toolwindow', True)
-        self.muted_window.wm_attributes('-transparentcolor', '#000000')
-        
-        # Create frame for muted apps
-        self.muted_frame = tk.Frame(self.muted_window, bg='#000000', padx=10, pady=5)
-        self.muted_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Dictionary to store muted app icons
-        self.muted_apps = {}
-        
-        # Position muted window
-        self.muted_window.geometry("+5+20")
-    
-        # Pre-calculate common values
-        self.ico_x = win32api.GetSystemMetrics(win32con.SM_CXICON)
-        self.ico_y = win32api.GetSystemMetrics(win32con.SM_CYICON)
-        self.icon_scale = 1.5
-        self.new_size = (int(self.ico_x * self.icon_scale), int(self.ico_y * self.icon_scale))
+        # Fixed window size, padding and fonts for this monitor's DPI
+        self.apply_widget_scale()
 
     def overlay_disabled_icon(self, base_img):
         """Overlay the disabled icon on the base image"""
-        if self.disabled_icon is None:
+        # Disabled badge at 50% of base image size, pre-rendered per size
+        disabled_icon = self.assets.get_badge(int(base_img.size[0] * 0.5))
+        if disabled_icon is None:
             return base_img
             
-        # Resize disabled icon to 50% of base image size
-        disabled_size = (int(base_img.size[0] * 0.5), int(base_img.size[1] * 0.5))
-        disabled_icon = self.disabled_icon.resize(disabled_size, Image.Resampling.LANCZOS)
-        if disabled_icon.mode != 'RGBA':
-            disabled_icon = disabled_icon.convert('RGBA')
-            
         # Create a new image with alpha channel
         result = Image.new('RGBA', base_img.size, (0, 0, 0, 0))
         
@@ -145,21 +213,50 @@ class VolumeOverlay:
         
         return result
     
-    @lru_cache(maxsize=32)
     def get_process_exe(self, app_name):
-        """Get executable path for a process name with caching"""
-        for proc in psutil.process_iter(['name', 'exe']):
-            if proc.info['name'].lower() == app_name.lower():
-                return proc.info['exe']
+        """Get executable path for an app name or pattern with caching"""
+        if app_name in self.process_index:
+            return self.process_index[app_name][1]
+        
+        # Every matching process shares the icon, so the first exe found will do
+        for info in get_target(app_name).find_processes():
+            if info['exe']:
+                self.process_index[app_name] = (info['pid'], info['exe'])
+                return info['exe']
         return None
+    
+    def attach_process_watcher(self, watcher):
+        """Clean up the muted strip and caches when processes exit"""
+        self.process_watcher = watcher
+        watcher.subscribe(self.handle_process_events)
+    
+    def handle_process_events(self, events):
+        """Drop state that points at processes which have exited"""
+        exited_pids = {event.pid for event in events if event.kind == 'exit'}
+        if not exited_pids:
+            return
+        
+        # Forget cached exe paths of exited processes
+        for app_name, (pid, _) in list(self.process_index.items()):
+            if pid in exited_pids:
+                del self.process_index[app_name]
+        
+        # Apps with no process left lose their cached icons and muted strip entry
+        gone = self.process_watcher.gone_apps(events, {key[0] for key in self.icon_cache} | set(self.muted_apps))
+        for key in list(self.icon_cache):
+            if key[0] in gone:
+                del self.icon_cache[key]
+        
+        changes = {app_name: False for app_name in gone if app_name in self.muted_apps}
+        if changes:
+            self.reconcile_muted_apps(changes)
+
+    def icon_size(self):
+        """Icon pixel size for the DPI of the monitor the overlay is on"""
+        return icon_size_for_dpi(get_monitor_dpi(*self.position))
 
-    def get_app_icon(self, app_name, is_muted=False):
+    def get_app_icon(self, app_name, is_muted=False, size=None):
         """Get the app icon with disabled overlay if needed"""
-        # Check cache first
-        cache_key = f"{app_name}_{'muted' if is_muted else 'normal'}"
-        if cache_key in self.icon_cache:
-            return self.icon_cache[cache_key], app_name
-            
         try:
             if app_name == 'focused':
                 hwnd = win32gui.GetForegroundWindow()
@@ -167,34 +264,22 @@ class VolumeOverlay:
                 proc = psutil.Process(pid)
                 app_name = proc.name()
             
+            # Check cache first; every monitor DPI gets its own exact-size variant
+            if size is None:
+                size = self.icon_size()
+            cache_key = (app_name, is_muted, size)
+            if cache_key in self.icon_cache:
+                return self.icon_cache[cache_key], app_name
+            
             # Get executable path using cached function
             exe_path = self.get_process_exe(app_name)
             if not exe_path:
                 return None, app_name
             
-            # Get icon
-            large, small = win32gui.ExtractIconEx(exe_path, 0, 1)
-            win32gui.DestroyIcon(small[0])
-            
-            hdc = win32ui.CreateDCFromHandle(win32gui.GetDC(0))
-            hbmp = win32ui.CreateBitmap()
-            hbmp.CreateCompatibleBitmap(hdc, self.ico_x, self.ico_y)
-            hdc = hdc.CreateCompatibleDC()
-            
-            hdc.SelectObject(hbmp)
-            hdc.DrawIcon((0, 0), large[0])
-            
-            win32gui.DestroyIcon(large[0])
-            
-            bmpstr = hbmp.GetBitmapBits(True)
-            img = Image.frombuffer(
-                'RGBA',
-                (self.ico_x, self.ico_y),
-                bmpstr, 'raw', 'BGRA', 0, 1
-            )
-            
-            # Scale the image using pre-calculated size
-            img = img.resize(self.new_size, Image.Resampling.LANCZOS)
+            # Extract at the target size from the best image in the exe
+            img = extract_icon(exe_path, size)
+            if img is None:
+                return None, app_name
             
             # If this is a muted icon, darken it
             if is_muted:
@@ -226,23 +311,40 @@ class VolumeOverlay:
     
     def update_muted_apps(self, app_name, volume_percent):
         """Update the muted apps display"""
-        if volume_percent == 0:
-            if app_name not in self.muted_apps:
-                img, _ = self.get_app_icon(app_name, is_muted=True)
-                if img:
-                    img = self.overlay_disabled_icon(img)
-                    photo = ImageTk.PhotoImage(img)
-                    label = tk.Label(self.muted_frame, image=photo, bg='#000000')
-                    label.image = photo
-                    label.pack(side=tk.LEFT, padx=5)
-                    self.muted_apps[app_name] = label
-                    self.muted_window.deiconify()
-        else:
-            if app_name in self.muted_apps:
-                self.muted_apps[app_name].destroy()
+        self.reconcile_muted_apps({app_name: volume_percent == 0})
+    
+    def reconcile_muted_apps(self, changes):
+        """Apply a map of app_name -> muted to the muted strip in one pass"""
+        changed = False
+        for app_name, muted in changes.items():
+            if muted:
+                if app_name not in self.muted_apps:
+                    img, _ = self.get_app_icon(app_name, is_muted=True)
+                    if img:
+                        img = self.overlay_disabled_icon(img)
+                        if self.image_renderer is not None:
+                            self.muted_apps[app_name] = img
+                        else:
+                            photo = ImageTk.PhotoImage(img)
+                            label = tk.Label(self.muted_frame, image=photo, bg='#000000')
+                            label.image = photo
+                            label.pack(side=tk.LEFT, padx=5)
+                            self.muted_apps[app_name] = label
+                        changed = True
+            elif app_name in self.muted_apps:
+                if self.image_renderer is None:
+                    self.muted_apps[app_name].destroy()
                 del self.muted_apps[app_name]
-                if not self.muted_apps:
-                    self.muted_window.withdraw()
+                changed = True
+        
+        # Show or hide the strip once for the whole batch
+        if self.muted_apps:
+            if changed and self.image_renderer is not None:
+                strip = compose_strip(list(self.muted_apps.values()))
+                self.muted_presenter.present(strip, *self.muted_position)
+            self.muted_window.deiconify()
+        else:
+            self.muted_window.withdraw()
     
     def update_progress_bar(self, volume_percent):
         """Update the progress bar to show current volume level"""
@@ -254,129 +356,194 @@ class VolumeOverlay:
             
             fill_width = int(width * volume_percent)
             
+            height = self.scaled(4)
+            
             # Draw background track (darker color)
             self.progress_bar.delete('all')
-            self.progress_bar.create_rectangle(0, 0, width, 4, fill='#0f0f0f', outline='')
+            self.progress_bar.create_rectangle(0, 0, width, height, fill='#0f0f0f', outline='')
             
             # Draw current volume level (brighter color)
-            self.progress_bar.create_rectangle(0, 0, fill_width, 4, fill='#ffffff', outline='')
+            self.progress_bar.create_rectangle(0, 0, fill_width, height, fill='#ffffff', outline='')
         else:
             self.progress_bar.delete('all')
 
     def show(self, app_name, volume_percent):
-        # Update muted apps display
-        if volume_percent >= 0:
-            self.update_muted_apps(app_name, volume_percent)
+        # A show means someone is pressing keys, so background work tightens up
+        if self.scheduler is not None:
+            self.scheduler.mark_activity()
+        
+        # Follow the DPI of the overlay's monitor before sizing anything
+        self.update_scale()
         
         # Get app icon and name
         img, app_name = self.get_app_icon(app_name, is_muted=False)
+        self.current_app = app_name
+        
+        # Update muted apps display, unless the state store already does
+        if volume_percent >= 0 and self.state_store is None:
+            self.update_muted_apps(app_name, volume_percent)
         
         # Position in top-left corner
-        self.window.geometry("+10+80")
+        self.window.geometry(f"+{self.position[0]}+{self.position[1]}")
         
         # Cancel any existing fade timer
-        if self.fade_timer:
-            self.window.after_cancel(self.fade_timer)
+        self.cancel_fade()
         
         if volume_percent == -1:
-            # Calculate required width based on text first
-            temp_text = f"No audio source detected for {app_name}"
-            self.volume_label.configure(
-                text=temp_text,
-                font=('Segoe UI', 16, 'bold'),
-                width=0,
-                anchor='w',
-                pady=15
-            )
-            self.volume_label.update_idletasks()
-            text_width = self.volume_label.winfo_reqwidth()
-            window_width = max(300, text_width + 40)
-            
-            # Set window size before any other updates
-            self.window.geometry(f"{window_width}x65")
-            self.window.update_idletasks()
-            
-            # Update the content
-            self.icon_label.configure(image='')
-            self.volume_label.configure(
-                text=temp_text,
-                font=('Segoe UI', 16, 'bold'),
-                width=0,
-                anchor='w',
-                pady=15
-            )
-            self.progress_bar.delete('all')
+            self.show_text(f"No audio source detected for {app_name}")
             
         elif img:
-            # Reset to normal size for volume display
-            self.window.geometry("165x65")
-            self.window.update_idletasks()
-            
-            # Update the label
-            photo = ImageTk.PhotoImage(img)
-            self.icon_label.configure(image=photo)
-            self.icon_label.image = photo
-            
-            self.volume_label.configure(
-                text=f"{int(volume_percent * 100)}%",
-                font=('Segoe UI', 20, 'bold'),
-                width=13,
-                anchor='w',
-                pady=0
-            )
-            
-            # Update progress bar
-            self.update_progress_bar(volume_percent)
+            self.show_icon(img)
+            self.show_level(volume_percent)
             
         else:
-            # Calculate required width based on text first
-            temp_text = f"No audio source detected for {app_name}"
-            self.volume_label.configure(
-                text=temp_text,
-                font=('Segoe UI', 16, 'bold'),
-                width=0,
-                anchor='w',
-                pady=15
-            )
-            self.volume_label.update_idletasks()
-            text_width = self.volume_label.winfo_reqwidth()
-            window_width = max(300, text_width + 40)
-            
-            # Set window size before any other updates
-            self.window.geometry(f"{window_width}x65")
-            self.window.update_idletasks()
-            
-            # Update the content
-            self.icon_label.configure(image='')
-            self.volume_label.configure(
-                text=temp_text,
-                font=('Segoe UI', 16, 'bold'),
-                width=0,
-                anchor='w',
-                pady=15
-            )
-            self.progress_bar.delete('all')
+            self.show_text(f"No audio source detected for {app_name}")
+        
+        self.present()
+    
+    def show_icon(self, img):
+        """Show the app icon at the normal overlay size"""
+        if self.image_renderer is not None:
+            # Drawn together with the level in show_level
+            self.current_icon = img
+            return
+        
+        # Reset to normal size for volume display
+        self.window.geometry(f"{self.scaled(OVERLAY_WIDTH)}x{self.scaled(OVERLAY_HEIGHT)}")
+        self.window.update_idletasks()
+        
+        # Update the label
+        photo = ImageTk.PhotoImage(img)
+        self.icon_label.configure(image=photo)
+        self.icon_label.image = photo
+    
+    def show_level(self, volume_percent):
+        """Update the percentage and progress bar"""
+        if self.image_renderer is not None:
+            frame = self.image_renderer.render(self.current_icon, volume_percent)
+            self.presenter.present(frame, *self.position, alpha=self.alpha)
+            return
+        
+        self.volume_label.configure(
+            text=f"{int(volume_percent * 100)}%",
+            font=self.level_font,
+            width=13,
+            anchor='w',
+            pady=0
+        )
+        
+        # Update progress bar
+        self.update_progress_bar(volume_percent)
+    
+    def attach_state_store(self, store):
+        """Follow volume/mute changes from the state store, wherever they come from"""
+        self.state_store = store
+        store.subscribe_batch(self.handle_state_changes)
+    
+    def handle_state_changes(self, changes):
+        """Called from notification threads, so hand over to the Tk thread"""
+        self.window.after(0, self.apply_state_changes, changes)
+    
+    def apply_state_changes(self, changes):
+        """Update the muted strip in one pass and the visible level for a batch of app states"""
+        # Apps whose last session is gone (None) leave the strip
+        self.reconcile_muted_apps({app_name: state is not None and (state[1] or state[0] == 0)
+                                   for app_name, state in changes.items()})
+        
+        # Refresh the overlay live if it is showing one of these apps
+        if self.fade_timer and self.current_app:
+            for app_name, state in changes.items():
+                if state is not None and app_name.lower() == self.current_app.lower():
+                    self.show_level(0 if state[1] else state[0])
+    
+    def show_scene(self, scene_name, muted_changes):
+        """Show one summary overlay for a scene and reconcile the muted strip"""
+        if self.state_store is None:
+            self.reconcile_muted_apps(muted_changes)
+        
+        self.update_scale()
+        self.window.geometry(f"+{self.position[0]}+{self.position[1]}")
+        self.cancel_fade()
+        self.show_text(f"{scene_name}: {len(muted_changes)} apps")
+        self.present()
+    
+    def show_text(self, text):
+        """Show a text-only message sized to fit"""
+        if self.image_renderer is not None:
+            self.presenter.present(self.image_renderer.render_text(text), *self.position, alpha=self.alpha)
+            return
+        
+        # Calculate required width based on text first
+        self.volume_label.configure(
+            text=text,
+            font=self.message_font,
+            width=0,
+            anchor='w',
+            pady=self.scaled(15)
+        )
+        self.volume_label.update_idletasks()
+        text_width = self.volume_label.winfo_reqwidth()
+        window_width = max(self.scaled(300), text_width + self.scaled(40))
+        
+        # Set window size before any other updates
+        self.window.geometry(f"{window_width}x{self.scaled(OVERLAY_HEIGHT)}")
+        self.window.update_idletasks()
+        
+        # Update the content
+        self.icon_label.configure(image='')
+        self.volume_label.configure(
+            text=text,
+            font=self.message_font,
+            width=0,
+            anchor='w',
+            pady=self.scaled(15)
+        )
+        self.progress_bar.delete('all')
+    
+    def present(self):
+        """Show the window at full opacity and start the fade out timer"""
+        profiler_capture.record_event('overlay_render')
         
         # Show window and set initial opacity
         self.alpha = 1.0
-        self.window.attributes('-alpha', self.alpha)
+        self.set_alpha(self.alpha)
         self.window.deiconify()
         
         # Start fade out timer
-        self.fade_timer = self.window.after(1000, self.fade_out)
+        self.fade_timer = self.schedule(1000, self.fade_out)
+    
+    def set_alpha(self, alpha):
+        if self.image_renderer is not None:
+            self.presenter.set_alpha(alpha)
+        else:
+            self.window.attributes('-alpha', alpha)
+    
+    def schedule(self, delay, callback):
+        """Run callback after delay ms, through the shared scheduler if there is one"""
+        if self.scheduler is not None:
+            return self.scheduler.call_later(delay, callback)
+        return self.window.after(delay, callback)
+    
+    def cancel_fade(self):
+        if self.fade_timer:
+            if self.scheduler is not None:
+                self.scheduler.cancel(self.fade_timer)
+            else:
+                self.window.after_cancel(self.fade_timer)
+            self.fade_timer = None
     
     def fade_out(self):
         """Fade out the window"""
-        if self.fade_timer:
-            self.window.after_cancel(self.fade_timer)
+        self.cancel_fade()
         
+        # The fade steps only exist while the window is visible; once hidden nothing is pending
         def update_opacity():
             self.alpha -= 1.0 / self.fade_steps
             if self.alpha > 0:
-                self.window.attributes('-alpha', self.alpha)
-                self.fade_timer = self.window.after(self.fade_duration // self.fade_steps, update_opacity)
+                self.set_alpha(self.alpha)
+                self.fade_timer = self.schedule(self.fade_duration // self.fade_steps, update_opacity)
             else:
                 self.window.withdraw()
                 self.fade_timer = None
         
-        self.fade_timer = self.window.after(self.fade_duration // self.fade_steps, update_opacity) 
\ No newline at end of file
+        self.fade_timer = self.schedule(self.fade_duration // self.fade_steps, update_opacity)
@@ -0,0 +1,281 @@
+import os
+import sys
+import ctypes
+from ctypes import wintypes
+import tkinter as tk
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+# Same look as the widget overlay; sizes are at 96 DPI and scaled per monitor
+BG_COLOR = (0x2b, 0x2b, 0x2b, 255)
+TEXT_COLOR = (255, 255, 255, 255)
+TRACK_COLOR = (0x0f, 0x0f, 0x0f, 255)
+BAR_COLOR = (255, 255, 255, 255)
+OVERLAY_SIZE = (165, 65)
+PADDING = 10
+BAR_HEIGHT = 4
+
+
+def load_font(size):
+    """Segoe UI Bold at size px, or Pillow's default font elsewhere"""
+    fonts_dir = os.path.join(os.environ.get('WINDIR', r'C:\Windows'), 'Fonts')
+    for name in ('segoeuib.ttf', os.path.join(fonts_dir, 'segoeuib.ttf'), 'DejaVuSans-Bold.ttf'):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow < 10.1 has no sized default font
+        return ImageFont.load_default()
+
+
+def points_to_pixels(points):
+    # Tk font sizes are points at 96 DPI
+    return round(points * 96 / 72)
+
+
+class ImageRenderer:
+    """Composes the whole volume overlay into one pre-allocated RGBA buffer.
+
+    scale is the monitor DPI over 96 and applies to the size, padding, bar
+    and fonts alike, matching the DPI-sized icons.
+    """
+    def __init__(self, size=OVERLAY_SIZE, scale=1.0):
+        self.scale = scale
+        self.size = (round(size[0] * scale), round(size[1] * scale))
+        self.padding = round(PADDING * scale)
+        self.bar_height = max(1, round(BAR_HEIGHT * scale))
+        self.buffer = Image.new('RGBA', self.size, BG_COLOR)
+        self.draw = ImageDraw.Draw(self.buffer)
+        self.font = load_font(round(points_to_pixels(20) * scale))
+        self.message_font = load_font(round(points_to_pixels(16) * scale))
+        # Rendered "0%".."100%" text runs, built once each
+        self.glyph_runs = {}
+
+    def prewarm(self):
+        """Render every percentage text run up front"""
+        for percent in range(101):
+            self.glyph_run(percent)
+
+    def glyph_run(self, percent):
+        if percent not in self.glyph_runs:
+            text = f"{percent}%"
+            left, top, right, bottom = self.font.getbbox(text)
+            run = Image.new('RGBA', (right, bottom), (0, 0, 0, 0))
+            ImageDraw.Draw(run).text((0, 0), text, font=self.font, fill=TEXT_COLOR)
+            self.glyph_runs[percent] = run
+        return self.glyph_runs[percent]
+
+    def render(self, icon, volume_percent):
+        """Draw icon, percentage and bar into the buffer and return it.
+
+        The buffer is reused by the next call, so present it before then.
+        """
+        width, height = self.size
+        padding = self.padding
+        self.buffer.paste(BG_COLOR, (0, 0, width, height))
+
+        text_x = padding
+        if icon is not None:
+            icon_y = max(0, (height - icon.size[1]) // 2)
+            self.buffer.alpha_composite(icon.convert('RGBA') if icon.mode != 'RGBA' else icon,
+                                        (padding, icon_y))
+            text_x = padding + icon.size[0] + padding
+
+        run = self.glyph_run(int(volume_percent * 100))
+        bar_y = height - padding - self.bar_height
+        self.buffer.alpha_composite(run, (text_x, max(0, bar_y - run.size[1] - round(2 * self.scale))))
+
+        # Background track, then the current level
+        bar_width = width - padding - text_x
+        bar_bottom = bar_y + self.bar_height - 1
+        self.draw.rectangle((text_x, bar_y, text_x + bar_width - 1, bar_bottom), fill=TRACK_COLOR)
+        fill_width = int(bar_width * volume_percent)
+        if fill_width > 0:
+            self.draw.rectangle((text_x, bar_y, text_x + fill_width - 1, bar_bottom), fill=BAR_COLOR)
+        return self.buffer
+
+    def render_text(self, text):
+        """Render a text-only message sized to fit, like the widget overlay"""
+        left, top, right, bottom = self.message_font.getbbox(text)
+        width = max(round(300 * self.scale), right + round(40 * self.scale))
+        image = Image.new('RGBA', (width, self.size[1]), BG_COLOR)
+        ImageDraw.Draw(image).text((self.padding, (self.size[1] - bottom) // 2), text,
+                                   font=self.message_font, fill=TEXT_COLOR)
+        return image
+
+
+def compose_strip(icons, padx=5, padding=(10, 5)):
+    """Lay muted icons out in a row on a fully transparent background"""
+    if not icons:
+        return None
+    width = padding[0] * 2 + sum(icon.size[0] + padx * 2 for icon in icons)
+    height = padding[1] * 2 + max(icon.size[1] for icon in icons)
+    strip = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    x = padding[0]
+    for icon in icons:
+        x += padx
+        strip.alpha_composite(icon.convert('RGBA') if icon.mode != 'RGBA' else icon, (x, padding[1]))
+        x += icon.size[0] + padx
+    return strip
+
+
+class BLENDFUNCTION(ctypes.Structure):
+    _fields_ = [('BlendOp', ctypes.c_ubyte), ('BlendFlags', ctypes.c_ubyte),
+                ('SourceConstantAlpha', ctypes.c_ubyte), ('AlphaFormat', ctypes.c_ubyte)]
+
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [('biSize', ctypes.c_uint32), ('biWidth', ctypes.c_int32), ('biHeight', ctypes.c_int32),
+                ('biPlanes', ctypes.c_uint16), ('biBitCount', ctypes.c_uint16),
+                ('biCompression', ctypes.c_uint32), ('biSizeImage', ctypes.c_uint32),
+                ('biXPelsPerMeter', ctypes.c_int32), ('biYPelsPerMeter', ctypes.c_int32),
+                ('biClrUsed', ctypes.c_uint32), ('biClrImportant', ctypes.c_uint32)]
+
+
+class POINT(ctypes.Structure):
+    _fields_ = [('x', ctypes.c_long), ('y', ctypes.c_long)]
+
+
+class SIZE(ctypes.Structure):
+    _fields_ = [('cx', ctypes.c_long), ('cy', ctypes.c_long)]
+
+
+GWL_EXSTYLE = -20
+WS_EX_LAYERED = 0x00080000
+AC_SRC_ALPHA = 0x01
+ULW_ALPHA = 0x02
+
+
+def declare_layered_window_api(user32, gdi32):
+    """Declare the signatures LayeredWindowPresenter calls with.
+
+    Without them ctypes passes handles as C ints, which truncates or
+    rejects 64-bit handles.
+    """
+    gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+    gdi32.CreateCompatibleDC.restype = wintypes.HDC
+    gdi32.CreateDIBSection.argtypes = [wintypes.HDC, ctypes.POINTER(BITMAPINFOHEADER), wintypes.UINT,
+                                       ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD]
+    gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+    gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+    gdi32.SelectObject.restype = wintypes.HGDIOBJ
+    gdi32.DeleteDC.argtypes = [wintypes.HDC]
+    gdi32.DeleteDC.restype = wintypes.BOOL
+    gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+    gdi32.DeleteObject.restype = wintypes.BOOL
+    user32.GetWindowLongW.argtypes = [wintypes.HWND, ctypes.c_int]
+    user32.GetWindowLongW.restype = wintypes.LONG
+    user32.SetWindowLongW.argtypes = [wintypes.HWND, ctypes.c_int, wintypes.LONG]
+    user32.SetWindowLongW.restype = wintypes.LONG
+    user32.UpdateLayeredWindow.argtypes = [wintypes.HWND, wintypes.HDC, ctypes.POINTER(POINT), ctypes.POINTER(SIZE),
+                                           wintypes.HDC, ctypes.POINTER(POINT), wintypes.COLORREF,
+                                           ctypes.POINTER(BLENDFUNCTION), wintypes.DWORD]
+    user32.UpdateLayeredWindow.restype = wintypes.BOOL
+
+
+class LayeredWindowPresenter:
+    """Shows images in a per-pixel-alpha layered window (Windows only)"""
+    def __init__(self, window):
+        self.window = window
+        self.user32 = ctypes.windll.user32
+        self.gdi32 = ctypes.windll.gdi32
+        declare_layered_window_api(self.user32, self.gdi32)
+        self.window.update_idletasks()
+        self.hwnd = int(self.window.wm_frame(), 16)
+        style = self.user32.GetWindowLongW(self.hwnd, GWL_EXSTYLE)
+        self.user32.SetWindowLongW(self.hwnd, GWL_EXSTYLE, style | WS_EX_LAYERED)
+        # DIB surfaces per size, allocated once and reused for every frame
+        self.surfaces = {}
+        self.current = None
+        self.position = (0, 0)
+
+    def _surface(self, size):
+        if size not in self.surfaces:
+            # Text messages come in many widths; don't keep a surface for each
+            if len(self.surfaces) >= 8:
+                self._free_surfaces(keep=self.current)
+            header = BITMAPINFOHEADER()
+            header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+            header.biWidth = size[0]
+            header.biHeight = -size[1]  # Top-down rows
+            header.biPlanes = 1
+            header.biBitCount = 32
+            hdc = self.gdi32.CreateCompatibleDC(None)
+            bits = ctypes.c_void_p()
+            hbmp = self.gdi32.CreateDIBSection(hdc, ctypes.byref(header), 0, ctypes.byref(bits), None, 0)
+            self.gdi32.SelectObject(hdc, hbmp)
+            self.surfaces[size] = (hdc, hbmp, bits)
+        return self.surfaces[size]
+
+    def _free_surfaces(self, keep=None):
+        for size, (hdc, hbmp, _) in list(self.surfaces.items()):
+            if size == keep:
+                continue
+            self.gdi32.DeleteDC(hdc)
+            self.gdi32.DeleteObject(hbmp)
+            del self.surfaces[size]
+
+    def destroy(self):
+        """Free every DC and DIB section; the presenter can't be used afterwards"""
+        self._free_surfaces()
+        self.current = None
+
+    def present(self, image, x, y, alpha=1.0):
+        # Layered windows want premultiplied BGRA
+        r, g, b, a = image.convert('RGBa').split()
+        data = Image.merge('RGBA', (b, g, r, a)).tobytes()
+        hdc, _, bits = self._surface(image.size)
+        ctypes.memmove(bits, data, len(data))
+        self.current = image.size
+        self.position = (x, y)
+        self.set_alpha(alpha)
+
+    def set_alpha(self, alpha):
+        if self.current is None:
+            return
+        hdc = self.surfaces[self.current][0]
+        blend = BLENDFUNCTION(0, 0, max(0, min(255, int(alpha * 255))), AC_SRC_ALPHA)
+        self.user32.UpdateLayeredWindow(
+            self.hwnd, None, ctypes.byref(POINT(*self.position)), ctypes.byref(SIZE(*self.current)),
+            hdc, ctypes.byref(POINT(0, 0)), 0, ctypes.byref(blend), ULW_ALPHA)
+
+
+class LabelPresenter:
+    """Shows images in a plain Tk label, flattened onto a background colour"""
+    def __init__(self, window, bg='#2b2b2b'):
+        self.window = window
+        self.bg = bg
+        self.label = tk.Label(window, bg=bg, borderwidth=0, highlightthickness=0)
+        self.label.pack()
+        self.photo = None
+
+    def present(self, image, x, y, alpha=1.0):
+        flat = Image.new('RGBA', image.size, self.bg)
+        flat.alpha_composite(image)
+        # Reuse the PhotoImage while the size stays the same
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == image.size:
+            self.photo.paste(flat)
+        else:
+            self.photo = ImageTk.PhotoImage(flat)
+            self.label.configure(image=self.photo)
+        self.window.geometry(f"{image.size[0]}x{image.size[1]}+{x}+{y}")
+        self.set_alpha(alpha)
+
+    def set_alpha(self, alpha):
+        self.window.attributes('-alpha', alpha)
+
+    def destroy(self):
+        # The label goes with its window; only the image needs letting go
+        self.photo = None
+
+
+def create_presenter(window, bg='#2b2b2b'):
+    """Layered window presenter on Windows, label presenter elsewhere or on failure"""
+    if sys.platform == 'win32':
+        try:
+            return LayeredWindowPresenter(window)
+        except Exception as e:
+            print(f"Error creating layered window, falling back to a label: {e}")
+    return LabelPresenter(window, bg)
@@ -0,0 +1,132 @@
+import itertools
+from collections import namedtuple
+import psutil
+from app_targets import get_target
+import trace_recorder
+
+# kind is 'start' or 'exit'
+ProcessEvent = namedtuple('ProcessEvent', ['kind', 'pid', 'name'])
+
+
+def snapshot_processes():
+    """Return {pid: name} for every running process"""
+    table = {}
+    for proc in psutil.process_iter(['pid', 'name']):
+        if proc.info['name']:
+            table[proc.info['pid']] = proc.info['name']
+    return table
+
+
+class FakeProcessTable:
+    """Scriptable process table for driving the watcher without real processes"""
+    def __init__(self, processes=None):
+        self._pids = itertools.count(5000)
+        self.processes = {}
+        for name in processes or []:
+            self.start(name)
+
+    def start(self, name, pid=None):
+        pid = pid if pid is not None else next(self._pids)
+        self.processes[pid] = name
+        return pid
+
+    def exit(self, pid):
+        self.processes.pop(pid, None)
+
+    def __call__(self):
+        return dict(self.processes)
+
+
+class ProcessWatcher:
+    """Low-frequency process lifecycle watcher.
+
+    Each poll takes one snapshot of the process table, diffs it against the
+    previous one and hands the resulting start/exit events to every subscriber
+    in a single call, so subscribers clean up once per change instead of
+    checking on every keypress.
+    """
+    def __init__(self, interval=2000, process_table=snapshot_processes):
+        self.interval = interval  # Milliseconds between polls
+        self.process_table = process_table
+        self.processes = None
+        self.subscribers = []
+        self.scheduler = None
+        self.task = None
+
+    def subscribe(self, callback):
+        """Register callback(events) to be called with each non-empty batch of events"""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def poll(self):
+        """Diff the process table once and publish the changes"""
+        try:
+            current = self.process_table()
+        except Exception as e:
+            print(f"Error reading process table: {e}")
+            return []
+
+        # The first snapshot is the baseline, not a burst of start events
+        if self.processes is None:
+            self.processes = current
+            return []
+
+        events = []
+        for pid, name in self.processes.items():
+            # A reused pid with a new name is an exit plus a start
+            if current.get(pid) != name:
+                events.append(ProcessEvent('exit', pid, name))
+        for pid, name in current.items():
+            if self.processes.get(pid) != name:
+                events.append(ProcessEvent('start', pid, name))
+        self.processes = current
+
+        for event in events:
+            trace_recorder.record(f'process_{event.kind}', pid=event.pid, name=event.name)
+
+        if events:
+            for callback in list(self.subscribers):
+                try:
+                    callback(events)
+                except Exception as e:
+                    print(f"Error in process event handler: {e}")
+        return events
+
+    def is_running(self, app_name):
+        """Check the last snapshot for any process matching an app name or pattern"""
+        if self.processes is None:
+            return True
+        target = get_target(app_name)
+        return any(target.matches(name) for name in self.processes.values())
+
+    def gone_apps(self, events, app_names):
+        """App names or patterns that matched an exited process and now match none.
+
+        Multi-process apps only count as gone once their last process exits.
+        'focused' follows the foreground window, not a process, so it never goes.
+        """
+        exited_names = {event.name for event in events if event.kind == 'exit'}
+        gone = set()
+        for app_name in app_names:
+            if app_name == 'focused':
+                continue
+            # Icons and strip entries may be keyed by a glob or regex target
+            target = get_target(app_name)
+            if any(target.matches(name) for name in exited_names) and not self.is_running(app_name):
+                gone.add(app_name)
+        return gone
+
+    def start(self, scheduler, idle_interval=None):
+        """Poll from the scheduler, backing off to idle_interval when nobody is active"""
+        self.poll()
+        self.task = scheduler.add_periodic('process-watcher', self.poll, self.interval,
+                                           idle_interval or self.interval * 5)
+        self.scheduler = scheduler
+
+    def stop(self):
+        if self.task is not None:
+            self.scheduler.cancel(self.task)
+            self.task = None
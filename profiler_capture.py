@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import cProfile
+import threading
+from collections import Counter
+
+# The capture in progress, if any. record_event only checks this, so the
+# instrumentation costs one global lookup when nobody is profiling.
+_capture = None
+_capture_lock = threading.Lock()
+
+
+def asset_report():
+    # Imported here so the audio and control modules don't pull in Pillow
+    from assets import get_registry
+    return get_registry().report()
+
+
+def user_data_dir():
+    """Per-user folder for files the app writes"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, "LuwesVolumeChanger")
+    base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(base, "luwes-volume-changer")
+
+
+def record_event(name):
+    """Count an event (e.g. 'hotkey', 'overlay_render') for the running capture"""
+    capture = _capture
+    if capture is not None:
+        capture.events[name] += 1
+
+
+def is_capturing():
+    return _capture is not None
+
+
+class ProfileCapture:
+    """Samples the stacks of every thread for a fixed time.
+
+    Writes a collapsed-stack file (for flamegraph.pl or speedscope), a pstats
+    file for the Tk thread when a Tk widget is given (cProfile only sees the
+    thread it runs on) and a JSON summary with the event counts recorded
+    during the capture window.
+    """
+    def __init__(self, duration=10, interval=0.005, out_dir=None, tk_widget=None, on_done=None):
+        self.duration = duration
+        self.interval = interval
+        self.out_dir = out_dir or os.path.join(user_data_dir(), "profiles")
+        self.tk_widget = tk_widget
+        self.on_done = on_done
+        self.stacks = Counter()
+        self.events = Counter()
+        self.samples = 0
+        self.profile = None
+        self.stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.base_path = os.path.join(self.out_dir, f"profile-{self.stamp}")
+        self.thread = None
+
+    def start(self):
+        global _capture
+        with _capture_lock:
+            if _capture is not None:
+                raise RuntimeError("A profile capture is already running")
+            _capture = self
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.started = time.perf_counter()
+        if self.tk_widget is not None:
+            self.tk_widget.after(0, self._start_tk_profile)
+        self.thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+        self.thread.start()
+        return self.base_path
+
+    def _start_tk_profile(self):
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def _stop_tk_profile(self):
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.base_path + ".pstats")
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        deadline = self.started + self.duration
+        while time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+        if self.tk_widget is not None:
+            # Stop cProfile on the thread it was started on
+            done = threading.Event()
+            self.tk_widget.after(0, lambda: (self._stop_tk_profile(), done.set()))
+            done.wait(timeout=5)
+        self._finish()
+
+    def _finish(self):
+        global _capture
+        elapsed = time.perf_counter() - self.started
+        with _capture_lock:
+            _capture = None
+        try:
+            with open(self.base_path + ".collapsed", 'w', encoding='utf-8') as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            summary = {
+                'started': self.stamp,
+                'duration': round(elapsed, 3),
+                'interval': self.interval,
+                'samples': self.samples,
+                'events': dict(self.events),
+                # Startup bytes read and decode time of the bundled assets
+                'assets': asset_report(),
+                'files': [os.path.basename(self.base_path + ext) for ext in ('.collapsed', '.pstats')
+                          if os.path.exists(self.base_path + ext)],
+            }
+            with open(self.base_path + ".json", 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=4)
+        except Exception as e:
+            print(f"Error writing profile: {e}")
+            return
+        if self.on_done is not None:
+            self.on_done(self.base_path)
+
+
+def start_capture(duration=10, tk_widget=None, on_done=None):
+    """Start a capture for the tray menu or control server; returns the output path prefix"""
+    return ProfileCapture(duration, tk_widget=tk_widget, on_done=on_done).start()
@@ -0,0 +1,95 @@
+import json
+import os
+import profiler_capture
+from audio_sessions import apply_batch, index_sessions, session_state
+
+# Scenes live in settings.json under this key:
+# "scenes": {"meeting": {"hotkey": "ctrl+alt+shift+1",
+#                        "apps": {"discord.exe": {"volume": 80, "muted": false},
+#                                 "brave.exe": {"muted": true}}}}
+SCENES_KEY = 'scenes'
+
+
+def load_scenes(settings_file="settings.json"):
+    """Load the scene map from the settings file"""
+    if not os.path.exists(settings_file):
+        return {}
+    try:
+        with open(settings_file, 'r') as f:
+            return json.load(f).get(SCENES_KEY, {})
+    except Exception as e:
+        print(f"Error loading scenes: {e}")
+        return {}
+
+
+def save_scene(name, apps, hotkey=None, settings_file="settings.json"):
+    """Store a scene in the settings file, keeping the rest of the settings"""
+    settings = {}
+    if os.path.exists(settings_file):
+        with open(settings_file, 'r') as f:
+            settings = json.load(f)
+    scenes = settings.setdefault(SCENES_KEY, {})
+    scene = scenes.setdefault(name, {})
+    scene['apps'] = apps
+    if hotkey is not None:
+        scene['hotkey'] = hotkey
+    with open(settings_file, 'w') as f:
+        json.dump(settings, f, indent=4)
+    return scene
+
+
+def scene_commands(scene):
+    """Turn a scene into a list of batch commands"""
+    commands = []
+    for app_name, state in scene.get('apps', {}).items():
+        if 'volume' in state:
+            commands.append({'op': 'set', 'app': app_name, 'volume': state['volume']})
+        if 'muted' in state:
+            commands.append({'op': 'mute' if state['muted'] else 'unmute', 'app': app_name})
+    return commands
+
+
+def activate_scene(backend, scene, state_store=None):
+    """Apply a scene in one batch.
+
+    Returns the batch results and a map of app_name -> muted for every app the
+    scene touched, ready for VolumeOverlay.show_scene.
+    """
+    results, _ = apply_batch(backend, scene_commands(scene), state_store)
+    muted_changes = {}
+    for result in results:
+        if 'error' in result:
+            continue
+        # Same convention as the hotkeys: muted or 0% both count as muted
+        muted_changes[result['app']] = result['muted'] or result['volume'] == 0
+    return results, muted_changes
+
+
+def capture_scene(backend):
+    """Snapshot the volume and mute state of every current session"""
+    apps = {}
+    for sessions in index_sessions(backend.enumerate_sessions()).values():
+        state = session_state(sessions[0].name, sessions)
+        apps[state['app']] = {'volume': state['volume'], 'muted': state['muted']}
+    return apps
+
+
+def scene_hotkey_pressed(on_activate, name):
+    profiler_capture.record_event('hotkey')
+    on_activate(name)
+
+
+def register_scene_hotkeys(scenes, on_activate):
+    """Bind each scene's hotkey to on_activate(scene_name) and return the handles"""
+    # Imported here so scenes can be loaded and applied without a keyboard hook
+    import keyboard
+    handles = []
+    for name, scene in scenes.items():
+        hotkey = scene.get('hotkey')
+        if not hotkey:
+            continue
+        try:
+            handles.append(keyboard.add_hotkey(hotkey, scene_hotkey_pressed, args=(on_activate, name)))
+        except Exception as e:
+            print(f"Error binding hotkey for scene {name}: {e}")
+    return handles
@@ -0,0 +1,178 @@
+import time
+from collections import deque
+
+
+def monotonic_ms():
+    return time.monotonic() * 1000
+
+
+class VirtualClock:
+    """Manually advanced clock for driving the scheduler in tests and replays"""
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def advance(self, ms):
+        self.now += ms
+
+    def __call__(self):
+        return self.now
+
+
+class Task:
+    """A periodic or one-shot job owned by the scheduler"""
+    def __init__(self, name, callback, due, interval=None, idle_interval=None, slack=0):
+        self.name = name
+        self.callback = callback
+        self.due = due
+        self.interval = interval  # None for one-shot tasks
+        self.idle_interval = idle_interval or interval
+        self.current_interval = interval
+        self.slack = slack  # How late the task may run so it can share a wakeup
+        self.cancelled = False
+        self.runs = 0
+        self.cpu_time = 0.0
+
+    @property
+    def periodic(self):
+        return self.interval is not None
+
+
+class Scheduler:
+    """Single owner of all periodic and deferred work on the Tk thread.
+
+    Only one Tk after() is pending at any time, armed for the earliest moment
+    that still satisfies every task's deadline, so co-due tasks share one
+    wakeup. Periodic tasks back off towards their idle_interval while no
+    activity is reported and snap back to their base interval on
+    mark_activity(). Times are in milliseconds; pass a VirtualClock to drive
+    it without Tk.
+    """
+    def __init__(self, clock=monotonic_ms, idle_after=5000):
+        self.clock = clock
+        self.idle_after = idle_after
+        self.last_activity = clock()
+        self.tasks = []
+        self.widget = None
+        self.timer = None
+        self.armed_for = None
+        # Wakeup timestamps of the last minute
+        self.wakeups = deque()
+        # name -> [runs, cpu seconds], kept after one-shot tasks finish
+        self.task_stats = {}
+
+    def attach(self, widget):
+        """Drive the scheduler from a Tk widget's event loop"""
+        self.widget = widget
+        self._arm()
+
+    def add_periodic(self, name, callback, interval, idle_interval=None, slack=None):
+        """Run callback every interval ms, backing off to idle_interval when idle"""
+        if slack is None:
+            slack = interval // 10
+        task = Task(name, callback, self.clock() + interval, interval, idle_interval, slack)
+        self.tasks.append(task)
+        self._arm()
+        return task
+
+    def call_later(self, delay, callback, name=None):
+        """Run callback once after delay ms"""
+        task = Task(name or getattr(callback, '__name__', 'call_later'), callback, self.clock() + delay)
+        self.tasks.append(task)
+        self._arm()
+        return task
+
+    def cancel(self, task):
+        if task is None or task.cancelled:
+            return
+        task.cancelled = True
+        if task in self.tasks:
+            self.tasks.remove(task)
+        self._arm()
+
+    def is_idle(self):
+        return self.clock() - self.last_activity >= self.idle_after
+
+    def mark_activity(self):
+        """Report user activity; periodic tasks return to their base interval"""
+        now = self.clock()
+        was_idle = now - self.last_activity >= self.idle_after
+        self.last_activity = now
+        if not was_idle:
+            return
+        for task in self.tasks:
+            if task.periodic:
+                task.current_interval = task.interval
+                task.due = min(task.due, now + task.interval)
+        self._arm()
+
+    def next_wakeup(self):
+        """Latest time that still runs the most urgent task within its slack"""
+        if not self.tasks:
+            return None
+        return min(task.due + task.slack for task in self.tasks)
+
+    def run_due(self):
+        """Run every task that is due now in a single wakeup"""
+        now = self.clock()
+        self.wakeups.append(now)
+        while self.wakeups and self.wakeups[0] < now - 60000:
+            self.wakeups.popleft()
+
+        # Periodic tasks may also run up to their slack early to share this wakeup
+        due = [task for task in self.tasks
+               if task.due <= now or (task.periodic and task.due - task.slack <= now)]
+        for task in due:
+            if task.cancelled:
+                continue
+            started = time.thread_time()
+            try:
+                task.callback()
+            except Exception as e:
+                print(f"Error in scheduled task {task.name}: {e}")
+            elapsed = time.thread_time() - started
+            task.cpu_time += elapsed
+            task.runs += 1
+            totals = self.task_stats.setdefault(task.name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += elapsed
+
+            if task.cancelled:
+                continue
+            if task.periodic:
+                if self.is_idle():
+                    # Back off exponentially up to the idle interval
+                    task.current_interval = min(task.idle_interval, task.current_interval * 2)
+                task.due = self.clock() + task.current_interval
+            elif task in self.tasks:
+                self.tasks.remove(task)
+        return len(due)
+
+    def stats(self):
+        """Wakeups in the last minute plus runs and CPU seconds per task name"""
+        now = self.clock()
+        return {
+            'wakeups_per_minute': sum(1 for t in self.wakeups if t >= now - 60000),
+            'tasks': {name: {'runs': runs, 'cpu_time': cpu_time}
+                      for name, (runs, cpu_time) in self.task_stats.items()},
+        }
+
+    def _arm(self):
+        """Keep exactly one Tk timer pending, for the next wakeup"""
+        if self.widget is None:
+            return
+        wake_at = self.next_wakeup()
+        if wake_at == self.armed_for and self.timer is not None:
+            return
+        if self.timer is not None:
+            self.widget.after_cancel(self.timer)
+            self.timer = None
+        self.armed_for = wake_at
+        if wake_at is not None:
+            delay = max(0, int(wake_at - self.clock()))
+            self.timer = self.widget.after(delay, self._wake)
+
+    def _wake(self):
+        self.timer = None
+        self.armed_for = None
+        self.run_due()
+        self._arm()
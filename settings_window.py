@@ -8,6 +8,7 @@ import sys
 import subprocess
 import psutil
 import time
+from assets import get_registry
 
 class SettingsWindow:
     def __init__(self):
@@ -91,12 +92,7 @@ class SettingsWindow:
         self.window.option_add('*TEntry.disabledForeground', self.fg_color)
         
         # Set window icon
-        try:
-            icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "image.ico")
-            if os.path.exists(icon_path):
-                self.window.iconbitmap(icon_path)
-        except Exception as e:
-            print(f"Could not set window icon: {e}")
+        self.set_window_icon(self.window)
         
         # Create the main frame
         main_frame = ttk.Frame(self.window, padding="10", style="TFrame")
@@ -127,7 +123,7 @@ class SettingsWindow:
         self.entries = {}
         row = 1
         for app, settings in self.current_settings.items():
-            if app == 'overlay_enabled':
+            if app not in self.default_settings:
                 continue
                 
             # Application name
@@ -200,7 +196,19 @@ class SettingsWindow:
                                      selectcolor=self.button_bg,
                                      activebackground=self.bg_color,
                                      activeforeground=self.fg_color)
-        overlay_check.grid(row=row, column=0, columnspan=4, pady=10, sticky='w')
+        overlay_check.grid(row=row, column=0, columnspan=2, pady=10, sticky='w')
+        
+        # Add overlay renderer toggle
+        self.image_renderer_var = tk.BooleanVar(value=self.current_settings.get('overlay_renderer', 'widgets') == 'image')
+        renderer_check = tk.Checkbutton(main_frame,
+                                      text="Draw Overlay as One Image",
+                                      variable=self.image_renderer_var,
+                                      bg=self.bg_color,
+                                      fg=self.fg_color,
+                                      selectcolor=self.button_bg,
+                                      activebackground=self.bg_color,
+                                      activeforeground=self.fg_color)
+        renderer_check.grid(row=row, column=2, columnspan=2, pady=10, sticky='w')
         row += 1
         
         # Buttons frame
@@ -261,7 +269,16 @@ class SettingsWindow:
         
         # Ensure the window is properly initialized
         self.window.update()
-    
+
+    def set_window_icon(self, window):
+        """Set the app icon from the shared asset registry (decoded once per run)"""
+        try:
+            photo = get_registry().get_photo("image.ico")
+            if photo is not None:
+                window.iconphoto(False, photo)
+        except Exception as e:
+            print(f"Could not set window icon: {e}")
+
     def start_move(self, event):
         # Only start moving if clicking on the title bar
         if event.widget == self.title_bar:
@@ -456,10 +473,22 @@ class SettingsWindow:
                         if key == 'overlay_enabled':
                             settings['overlay_enabled'] = value
                             continue
+                        
+                        if key == 'overlay_renderer':
+                            settings['overlay_renderer'] = value
+                            continue
+                        
+                        # Scenes and the mixer hotkey are edited in the file, keep them as they are
+                        if key in ('scenes', 'mixer_hotkey'):
+                            settings[key] = value
+                            continue
                             
                         # Extract app name from the key (e.g., 'brave_down' -> 'brave')
                         app = key.split('_')[0]
                         if app in settings:
+                            # Keep the saved app name, which may be a glob or 're:' pattern
+                            if isinstance(value, dict) and value.get('app_name'):
+                                settings[app]['app_name'] = value['app_name']
                             # Set the appropriate hotkey based on the key suffix
                             if key.endswith('_down'):
                                 settings[app]['down'] = value.get('hotkey', self.default_settings[app]['down'])
@@ -498,6 +527,12 @@ class SettingsWindow:
         
         # Save overlay setting
         new_settings['overlay_enabled'] = self.overlay_var.get()
+        new_settings['overlay_renderer'] = 'image' if self.image_renderer_var.get() else 'widgets'
+        
+        # Keep saved scenes and the mixer hotkey
+        for key in ('scenes', 'mixer_hotkey'):
+            if key in self.current_settings:
+                new_settings[key] = self.current_settings[key]
         
         try:
             with open(self.settings_file, 'w') as f:
@@ -512,12 +547,7 @@ class SettingsWindow:
             msg_window.configure(bg=self.bg_color)
             
             # Set icon
-            try:
-                icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "image.ico")
-                if os.path.exists(icon_path):
-                    msg_window.iconbitmap(icon_path)
-            except Exception as e:
-                print(f"Could not set messagebox icon: {e}")
+            self.set_window_icon(msg_window)
             
             # Add message
             msg_label = tk.Label(msg_window, 
@@ -556,6 +586,7 @@ class SettingsWindow:
             entry['up'].set(self.default_settings[app]['up'])
             entry['mute'].set(self.default_settings[app]['mute'])
         self.overlay_var.set(True)
+        self.image_renderer_var.set(False)
     
     def restart_application(self):
         self.window.destroy()
@@ -0,0 +1,55 @@
+import re
+import pytest
+from app_targets import AppTarget, get_target
+
+
+class Session:
+    def __init__(self, name):
+        self.name = name
+
+
+def by_name(*names):
+    index = {}
+    for name in names:
+        index.setdefault(name.lower(), []).append(Session(name))
+    return index
+
+
+def test_exact_name_is_case_insensitive():
+    target = AppTarget('discord.exe')
+    assert not target.is_pattern
+    assert target.matches('Discord.exe')
+    assert not target.matches('DiscordPTB.exe')
+    assert not target.matches(None)
+
+
+def test_glob():
+    target = AppTarget('*discord*.exe')
+    assert target.is_pattern
+    assert target.matches('Discord.exe')
+    assert target.matches('DiscordCanary.exe')
+    assert not target.matches('discord.exe.bak')
+
+
+def test_regex():
+    target = AppTarget(r're:discord(ptb|canary)?\.exe')
+    assert target.matches('DiscordPTB.exe')
+    # The whole name has to match
+    assert not target.matches('mydiscord.exe')
+
+
+def test_invalid_regex_raises():
+    with pytest.raises(re.error):
+        AppTarget('re:discord(')
+
+
+def test_filter_sessions_fans_out_to_every_match():
+    index = by_name('Discord.exe', 'DiscordPTB.exe', 'brave.exe')
+    assert [s.name for s in AppTarget('discord.exe').filter_sessions(index)] == ['Discord.exe']
+    names = sorted(s.name for s in AppTarget('discord*.exe').filter_sessions(index))
+    assert names == ['Discord.exe', 'DiscordPTB.exe']
+    assert AppTarget('spotify.exe').filter_sessions(index) == []
+
+
+def test_get_target_compiles_once():
+    assert get_target('*discord*.exe') is get_target('*discord*.exe')
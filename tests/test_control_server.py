@@ -0,0 +1,194 @@
+import json
+import socket
+import threading
+import pytest
+from audio_sessions import FakeAudioBackend
+from control_client import send_commands
+from control_server import ControlServer, parse_request
+from volume_state import VolumeStateStore
+
+
+@pytest.fixture
+def backend():
+    backend = FakeAudioBackend()
+    backend.add_session('discord.exe', volume=0.5)
+    backend.add_session('brave.exe', volume=0.8)
+    backend.focused_app = 'brave.exe'
+    return backend
+
+
+@pytest.fixture
+def server(backend):
+    shown = []
+    server = ControlServer(backend, on_batch_applied=lambda app, volume: shown.append((app, volume)),
+                           port=0, state_store=VolumeStateStore())
+    server.shown = shown
+    server.start()
+    yield server
+    server.stop()
+
+
+def send_line(server, line):
+    with socket.create_connection((server.host, server.port), timeout=5) as sock:
+        sock.sendall(line.encode('utf-8') + b'\n')
+        with sock.makefile('r', encoding='utf-8') as f:
+            return json.loads(f.readline())
+
+
+def session(backend, name):
+    return next(s for s in backend.sessions if s.name == name)
+
+
+def test_batch_uses_one_enumeration(server, backend):
+    before = backend.enumerations
+    response = send_commands([{'op': 'set', 'app': 'discord.exe', 'volume': 35},
+                              {'op': 'mute', 'app': 'brave.exe'},
+                              {'op': 'step', 'app': 'focused', 'delta': -10}], port=server.port)
+    assert response['ok']
+    assert backend.enumerations == before + 1
+    assert session(backend, 'discord.exe').volume == pytest.approx(0.35)
+    assert session(backend, 'brave.exe').muted
+    assert session(backend, 'brave.exe').volume == pytest.approx(0.7)
+    # One overlay update per batch, for the last change
+    assert server.shown == [('brave.exe', 0)]
+
+
+def test_text_commands(server, backend):
+    response = send_line(server, 'set *disc*.exe 20; query discord.exe')
+    assert response['ok']
+    assert response['results'][1]['volume'] == 20
+
+
+def test_query_reports_every_app(server):
+    response = send_commands([{'op': 'query'}], port=server.port)
+    apps = {state['app']: state['volume'] for state in response['results'][0]}
+    assert apps == {'discord.exe': 50, 'brave.exe': 80}
+
+
+def test_missing_app_is_an_error_result(server):
+    response = send_commands([{'op': 'mute', 'app': 'nothing.exe'}], port=server.port)
+    assert response['ok']
+    assert 'error' in response['results'][0]
+    assert server.shown == [('nothing.exe', -1)]
+
+
+@pytest.mark.parametrize('line', [
+    '{"commands": [{"op": "set", "app": 5, "volume": 35}]}',
+    '{"commands": [{"app": "discord.exe"}]}',
+    '{"commands": "set"}',
+    'launch discord.exe',
+    '{not json',
+])
+def test_malformed_requests_get_a_reply(server, backend, line):
+    response = send_line(server, line)
+    assert response['ok'] is False
+    assert session(backend, 'discord.exe').volume == pytest.approx(0.5)
+
+
+def test_connection_closes_after_a_bad_line(server, backend):
+    with socket.create_connection((server.host, server.port), timeout=5) as sock:
+        f = sock.makefile('r', encoding='utf-8')
+        sock.sendall(b'{"commands": [{"op": "set", "app": 5}]}\nmute discord.exe\n')
+        assert json.loads(f.readline())['ok'] is False
+        assert f.readline() == ''
+        f.close()
+    assert not session(backend, 'discord.exe').muted
+
+
+def test_http_request_body_is_not_applied(server, backend):
+    # What a web page's fetch() POST to the port looks like on the wire
+    body = b'mute discord.exe\n'
+    request = (b'POST / HTTP/1.1\r\nHost: 127.0.0.1:48765\r\nContent-Type: text/plain\r\n'
+               b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body)
+    with socket.create_connection((server.host, server.port), timeout=5) as sock:
+        sock.sendall(request)
+        f = sock.makefile('r', encoding='utf-8')
+        assert json.loads(f.readline())['ok'] is False
+        assert f.readline() == ''
+        f.close()
+    assert not session(backend, 'discord.exe').muted
+
+
+@pytest.mark.parametrize('line', [
+    'set discord.exe nan',
+    'set discord.exe inf',
+    'step discord.exe -inf',
+])
+def test_non_finite_text_values_are_rejected(server, backend, line):
+    assert send_line(server, line)['ok'] is False
+    assert session(backend, 'discord.exe').volume == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize('command', [
+    '{"op": "set", "app": "discord.exe", "volume": NaN}',
+    '{"op": "step", "app": "discord.exe", "delta": Infinity}',
+])
+def test_non_finite_json_values_are_rejected(server, backend, command):
+    response = send_line(server, '{"commands": [%s]}' % command)
+    assert 'error' in response['results'][0]
+    assert session(backend, 'discord.exe').volume == pytest.approx(0.5)
+
+
+def test_parse_request_validates_app_type():
+    with pytest.raises(ValueError):
+        parse_request('[{"op": "mute", "app": ["discord.exe"]}]')
+    assert parse_request('[{"op": "query"}]') == [{'op': 'query'}]
+
+
+def test_client_reports_a_closed_connection():
+    listener = socket.create_server(('127.0.0.1', 0))
+    port = listener.getsockname()[1]
+
+    def close_without_reply():
+        conn, _ = listener.accept()
+        conn.recv(1024)
+        conn.close()
+
+    thread = threading.Thread(target=close_without_reply)
+    thread.start()
+    try:
+        with pytest.raises(ConnectionError):
+            send_commands([{'op': 'query'}], port=port)
+    finally:
+        thread.join()
+        listener.close()
+
+
+def test_diagnostics_run_alongside_the_batch(server, backend, monkeypatch):
+    snapshots = []
+
+    def record_for(seconds, snapshot=None):
+        snapshots.append(snapshot)
+        return f'trace-{seconds}.jsonl'
+
+    monkeypatch.setattr('trace_recorder.record_for', record_for)
+    response = send_line(server, 'set discord.exe 35; record 0.1; mute brave.exe')
+    assert response['ok']
+    # The trace starts from the sessions and focus that existed before the batch
+    assert {s['app'] for s in snapshots[0]['sessions']} == {'discord.exe', 'brave.exe'}
+    assert snapshots[0]['focused'] == 'brave.exe'
+    assert response['results'][1] == {'trace': 'trace-0.1.jsonl'}
+    assert response['results'][0]['volume'] == 35
+    assert response['results'][2]['muted']
+    assert session(backend, 'discord.exe').volume == pytest.approx(0.35)
+
+
+@pytest.mark.parametrize('command', [
+    '{"op": "profile", "seconds": 0}',
+    '{"op": "profile", "seconds": 301}',
+    '{"op": "profile", "seconds": Infinity}',
+    '{"op": "profile", "seconds": NaN}',
+])
+def test_profile_length_is_bounded(server, monkeypatch, command):
+    started = []
+    monkeypatch.setattr('profiler_capture.start_capture', lambda *args, **kwargs: started.append(args))
+    response = send_line(server, '{"commands": [%s]}' % command)
+    assert 'error' in response['results'][0]
+    assert started == []
+
+
+def test_recording_can_be_stopped(server, monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path))
+    started = send_line(server, 'record 60')['results'][0]
+    assert send_line(server, 'stop_recording')['results'][0] == started
+    assert 'error' in send_line(server, 'stop_recording')['results'][0]
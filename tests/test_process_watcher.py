@@ -0,0 +1,123 @@
+from process_watcher import FakeProcessTable, ProcessEvent, ProcessWatcher
+from scheduler import Scheduler, VirtualClock
+
+
+def make_watcher(*names):
+    table = FakeProcessTable(names)
+    watcher = ProcessWatcher(process_table=table)
+    watcher.poll()
+    return table, watcher
+
+
+def test_first_poll_is_the_baseline():
+    table = FakeProcessTable(['discord.exe', 'brave.exe'])
+    watcher = ProcessWatcher(process_table=table)
+    assert watcher.poll() == []
+    assert watcher.is_running('discord.exe')
+
+
+def test_start_and_exit_events():
+    table, watcher = make_watcher('discord.exe')
+    pid = table.start('brave.exe')
+    assert watcher.poll() == [ProcessEvent('start', pid, 'brave.exe')]
+    table.exit(pid)
+    assert watcher.poll() == [ProcessEvent('exit', pid, 'brave.exe')]
+    assert watcher.poll() == []
+
+
+def test_reused_pid_is_an_exit_and_a_start():
+    table, watcher = make_watcher()
+    table.start('discord.exe', pid=42)
+    watcher.poll()
+    table.exit(42)
+    table.start('brave.exe', pid=42)
+    assert watcher.poll() == [ProcessEvent('exit', 42, 'discord.exe'), ProcessEvent('start', 42, 'brave.exe')]
+
+
+def test_subscribers_get_one_batch_per_poll():
+    table, watcher = make_watcher('a.exe', 'b.exe')
+    batches = []
+    watcher.subscribe(batches.append)
+    for pid in list(table.processes):
+        table.exit(pid)
+    watcher.poll()
+    assert len(batches) == 1
+    assert {event.name for event in batches[0]} == {'a.exe', 'b.exe'}
+
+
+def test_failing_subscriber_does_not_block_others():
+    table, watcher = make_watcher()
+    batches = []
+
+    def broken(events):
+        raise RuntimeError("boom")
+
+    watcher.subscribe(broken)
+    watcher.subscribe(batches.append)
+    table.start('discord.exe')
+    watcher.poll()
+    assert len(batches) == 1
+
+
+def test_unsubscribe():
+    table, watcher = make_watcher()
+    batches = []
+    watcher.subscribe(batches.append)
+    watcher.unsubscribe(batches.append)
+    table.start('discord.exe')
+    watcher.poll()
+    assert batches == []
+
+
+def test_is_running_matches_patterns():
+    table, watcher = make_watcher('Discord.exe', 'DiscordPTB.exe')
+    assert watcher.is_running('discord.exe')
+    assert watcher.is_running('*discord*.exe')
+    assert watcher.is_running('re:discord(ptb)?\\.exe')
+    assert not watcher.is_running('brave.exe')
+
+
+def test_gone_apps_waits_for_the_last_process():
+    table, watcher = make_watcher()
+    first = table.start('chrome.exe')
+    second = table.start('chrome.exe')
+    table.start('brave.exe')
+    watcher.poll()
+    apps = {'chrome.exe', 'brave.exe', 'focused'}
+
+    table.exit(first)
+    assert watcher.gone_apps(watcher.poll(), apps) == set()
+    table.exit(second)
+    assert watcher.gone_apps(watcher.poll(), apps) == {'chrome.exe'}
+
+
+def test_gone_apps_matches_patterns():
+    table, watcher = make_watcher()
+    pid = table.start('discord.exe')
+    other = table.start('discordptb.exe')
+    watcher.poll()
+    apps = {'disc*.exe', 're:^discord\\.exe$', 'brave.exe'}
+
+    table.exit(pid)
+    # The glob still matches the PTB client; the regex matched only the exited one
+    assert watcher.gone_apps(watcher.poll(), apps) == {'re:^discord\\.exe$'}
+    table.exit(other)
+    assert watcher.gone_apps(watcher.poll(), apps) == {'disc*.exe'}
+
+
+def test_scheduled_polling_until_stopped():
+    clock = VirtualClock()
+    scheduler = Scheduler(clock, idle_after=1000)
+    table = FakeProcessTable(['discord.exe'])
+    watcher = ProcessWatcher(interval=2000, process_table=table)
+    watcher.start(scheduler, idle_interval=8000)
+    events = []
+    watcher.subscribe(events.extend)
+
+    pid = table.start('brave.exe')
+    clock.advance(2000)
+    scheduler.run_due()
+    assert events == [ProcessEvent('start', pid, 'brave.exe')]
+
+    watcher.stop()
+    assert scheduler.tasks == []
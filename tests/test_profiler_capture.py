@@ -0,0 +1,20 @@
+import json
+from audio_sessions import FakeAudioBackend, apply_hotkey
+from profiler_capture import ProfileCapture, record_event
+
+
+def test_summary_counts_hotkeys(tmp_path):
+    backend = FakeAudioBackend([('discord.exe', 0.5, False)])
+    capture = ProfileCapture(duration=0.1, out_dir=str(tmp_path))
+    base_path = capture.start()
+    apply_hotkey(backend, 'discord.exe', 'up')
+    apply_hotkey(backend, 'discord.exe', 'mute')
+    record_event('overlay_render')
+    capture.thread.join(timeout=5)
+
+    with open(base_path + '.json', encoding='utf-8') as f:
+        summary = json.load(f)
+    assert summary['events'] == {'hotkey': 2, 'overlay_render': 1}
+    assert summary['samples'] > 0
+    assert 'bytes_read' in summary['assets']
+
@@ -0,0 +1,65 @@
+import json
+from audio_sessions import FakeAudioBackend
+from scenes import activate_scene, capture_scene, load_scenes, save_scene, scene_commands
+
+
+def test_scene_commands():
+    scene = {'apps': {'discord.exe': {'volume': 80, 'muted': False},
+                      'brave.exe': {'muted': True},
+                      'spotify.exe': {'volume': 20}}}
+    assert scene_commands(scene) == [
+        {'op': 'set', 'app': 'discord.exe', 'volume': 80},
+        {'op': 'unmute', 'app': 'discord.exe'},
+        {'op': 'mute', 'app': 'brave.exe'},
+        {'op': 'set', 'app': 'spotify.exe', 'volume': 20},
+    ]
+    assert scene_commands({}) == []
+
+
+def test_capture_scene_reports_every_app():
+    backend = FakeAudioBackend([('discord.exe', 0.8, False), ('brave.exe', 0.3, True),
+                                ('brave.exe', 0.5, True)])
+    assert capture_scene(backend) == {
+        'discord.exe': {'volume': 80, 'muted': False},
+        # Loudest session, muted only because every session is
+        'brave.exe': {'volume': 50, 'muted': True},
+    }
+
+
+def test_captured_scene_restores_the_state():
+    backend = FakeAudioBackend([('discord.exe', 0.8, False), ('brave.exe', 0.3, True)])
+    apps = capture_scene(backend)
+    for session in backend.sessions:
+        session.set_volume(1.0)
+        session.set_mute(False)
+
+    before = backend.enumerations
+    results, muted_changes = activate_scene(backend, {'apps': apps})
+    # The whole scene is one batch
+    assert backend.enumerations == before + 1
+    assert capture_scene(backend) == apps
+    assert muted_changes == {'discord.exe': False, 'brave.exe': True}
+
+
+def test_save_scene_keeps_other_settings(tmp_path):
+    settings_file = tmp_path / 'settings.json'
+    settings = {'discord_up': 'ctrl+up', 'overlay_renderer': 'image',
+                'scenes': {'gaming': {'hotkey': 'ctrl+alt+g', 'apps': {'discord.exe': {'muted': True}}}}}
+    settings_file.write_text(json.dumps(settings))
+
+    apps = {'discord.exe': {'volume': 80, 'muted': False}}
+    save_scene('meeting', apps, hotkey='ctrl+alt+m', settings_file=str(settings_file))
+    # Saving again without a hotkey keeps the bound one
+    save_scene('meeting', apps, settings_file=str(settings_file))
+
+    saved = json.loads(settings_file.read_text())
+    assert saved['discord_up'] == 'ctrl+up'
+    assert saved['overlay_renderer'] == 'image'
+    assert load_scenes(str(settings_file)) == {
+        'gaming': settings['scenes']['gaming'],
+        'meeting': {'apps': apps, 'hotkey': 'ctrl+alt+m'},
+    }
+
+
+def test_load_scenes_without_a_settings_file(tmp_path):
+    assert load_scenes(str(tmp_path / 'missing.json')) == {}
@@ -0,0 +1,122 @@
+import itertools
+from scheduler import Scheduler, VirtualClock
+
+
+class FakeWidget:
+    """Stands in for a Tk widget's after()/after_cancel() on a virtual clock"""
+    def __init__(self, clock):
+        self.clock = clock
+        self.ids = itertools.count()
+        self.timers = {}
+
+    def after(self, delay, callback):
+        timer_id = f"after#{next(self.ids)}"
+        self.timers[timer_id] = (self.clock() + delay, callback)
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def run_until(self, end):
+        """Fire timers in order until the clock reaches end"""
+        while self.timers:
+            timer_id, (due, callback) = min(self.timers.items(), key=lambda item: item[1][0])
+            if due > end:
+                break
+            del self.timers[timer_id]
+            self.clock.now = max(self.clock.now, due)
+            callback()
+        self.clock.now = end
+
+
+def attached(idle_after=5000):
+    clock = VirtualClock()
+    scheduler = Scheduler(clock, idle_after=idle_after)
+    widget = FakeWidget(clock)
+    scheduler.attach(widget)
+    return clock, scheduler, widget
+
+
+def test_periodic_task_runs_every_interval():
+    clock, scheduler, widget = attached(idle_after=60000)
+    runs = []
+    scheduler.add_periodic('poll', lambda: runs.append(clock()), 1000, slack=0)
+    widget.run_until(3500)
+    assert runs == [1000, 2000, 3000]
+
+
+def test_backs_off_when_idle_and_snaps_back_on_activity():
+    clock, scheduler, widget = attached(idle_after=1000)
+    task = scheduler.add_periodic('poll', lambda: None, 1000, idle_interval=8000, slack=0)
+    widget.run_until(1000)
+    assert task.current_interval == 2000
+    widget.run_until(3000)
+    assert task.current_interval == 4000
+    widget.run_until(7000)
+    assert task.current_interval == 8000
+    widget.run_until(15000)
+    # Capped at the idle interval
+    assert task.current_interval == 8000
+
+    scheduler.mark_activity()
+    assert task.current_interval == 1000
+    assert task.due <= clock() + 1000
+
+
+def test_co_due_tasks_share_one_wakeup():
+    clock, scheduler, widget = attached(idle_after=60000)
+    a = scheduler.add_periodic('a', lambda: None, 1000, slack=100)
+    b = scheduler.add_periodic('b', lambda: None, 1050, slack=100)
+    widget.run_until(1100)
+    assert (a.runs, b.runs) == (1, 1)
+    assert scheduler.stats()['wakeups_per_minute'] == 1
+
+
+def test_only_one_timer_is_pending():
+    clock, scheduler, widget = attached()
+    scheduler.add_periodic('a', lambda: None, 1000)
+    scheduler.add_periodic('b', lambda: None, 250)
+    scheduler.call_later(10, lambda: None)
+    assert len(widget.timers) == 1
+    widget.run_until(5000)
+    assert len(widget.timers) == 1
+
+
+def test_fade_leaves_no_timers():
+    # Same chain of one-shot steps VolumeOverlay.fade_out schedules
+    clock, scheduler, widget = attached()
+    state = {'alpha': 1.0, 'hidden': False}
+
+    def step():
+        state['alpha'] -= 1.0 / 30
+        if state['alpha'] > 0:
+            scheduler.call_later(10, step)
+        else:
+            state['hidden'] = True
+
+    scheduler.call_later(1000, lambda: scheduler.call_later(10, step))
+    widget.run_until(2000)
+    assert state['hidden']
+    assert scheduler.tasks == []
+    assert scheduler.next_wakeup() is None
+    assert widget.timers == {}
+
+
+def test_cancelled_task_never_runs():
+    clock, scheduler, widget = attached()
+    runs = []
+    task = scheduler.call_later(100, lambda: runs.append(1))
+    scheduler.cancel(task)
+    widget.run_until(1000)
+    assert runs == []
+    assert widget.timers == {}
+
+
+def test_stats_count_runs_per_task():
+    clock, scheduler, widget = attached(idle_after=60000)
+    scheduler.add_periodic('poll', lambda: None, 1000, slack=0)
+    scheduler.call_later(500, lambda: None, name='once')
+    widget.run_until(3000)
+    tasks = scheduler.stats()['tasks']
+    assert tasks['poll']['runs'] == 3
+    assert tasks['once']['runs'] == 1
@@ -0,0 +1,114 @@
+import pytest
+from audio_sessions import FakeAudioBackend, apply_hotkey
+from process_watcher import FakeProcessTable, ProcessWatcher
+import trace_recorder
+from trace_recorder import TraceRecorder, capture_snapshot, read_trace, record_for
+from trace_replay import NullOverlay, TraceReplayer
+from volume_state import VolumeStateStore
+
+
+class RecordingOverlay(NullOverlay):
+    def __init__(self):
+        super().__init__()
+        self.history = []
+
+    def show(self, app_name, volume_percent):
+        super().show(app_name, volume_percent)
+        self.history.append((app_name, round(volume_percent, 2)))
+
+
+def record_session(path):
+    """Record three 'up' presses and a muted app's exit; return what the live overlay showed"""
+    backend = FakeAudioBackend([('discord.exe', 0.5, False), ('spotify.exe', 0.3, True)])
+    backend.focused_app = 'discord.exe'
+    table = FakeProcessTable()
+    table.start('discord.exe', pid=1)
+    spotify_pid = table.start('spotify.exe', pid=2)
+    watcher = ProcessWatcher(process_table=table)
+    store = VolumeStateStore()
+    store.track(backend)
+    watcher.poll()
+
+    recorder = TraceRecorder(str(path))
+    recorder.start(capture_snapshot(backend, table))
+    shown = []
+    try:
+        for _ in range(3):
+            state = apply_hotkey(backend, 'focused', 'up', store)
+            shown.append((state[0], round(state[1], 2)))
+        table.exit(spotify_pid)
+        watcher.poll()
+    finally:
+        recorder.stop()
+    return shown
+
+
+def test_replay_starts_from_the_recorded_state(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    live = record_session(path)
+    assert live == [('discord.exe', 0.55), ('discord.exe', 0.6), ('discord.exe', 0.65)]
+
+    header, events = read_trace(str(path))
+    assert {s['app'] for s in header['snapshot']['sessions']} == {'discord.exe', 'spotify.exe'}
+    assert header['snapshot']['focused'] == 'discord.exe'
+
+    overlay = RecordingOverlay()
+    replayer = TraceReplayer(events, overlay=overlay, snapshot=header['snapshot'])
+    # Apps muted when recording started are on the strip before the first event
+    assert overlay.muted_apps == {'spotify.exe'}
+
+    report = replayer.run()
+    assert overlay.history == live
+    assert report['hotkey']['count'] == 3
+    # The muted app's process exited during the recording
+    assert overlay.muted_apps == set()
+
+
+def test_traces_without_a_snapshot_still_replay(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    recorder = TraceRecorder(str(path))
+    recorder.start()
+    recorder.stop()
+    header, events = read_trace(str(path))
+    assert events == []
+    assert TraceReplayer(events, snapshot=header.get('snapshot')).run() == {}
+
+
+def test_null_overlay_keeps_apps_with_processes_left():
+    table = FakeProcessTable()
+    first = table.start('chrome.exe')
+    table.start('chrome.exe')
+    watcher = ProcessWatcher(process_table=table)
+    watcher.poll()
+    overlay = NullOverlay()
+    overlay.attach_process_watcher(watcher)
+    overlay.apply_state_changes({'chrome.exe': (0.5, True)})
+
+    table.exit(first)
+    watcher.poll()
+    assert overlay.muted_apps == {'chrome.exe'}
+
+
+@pytest.mark.parametrize('seconds', [0, -1, 301, float('inf'), float('nan')])
+def test_record_length_is_bounded(tmp_path, seconds):
+    with pytest.raises(ValueError):
+        record_for(seconds, path=str(tmp_path / 'trace.jsonl'))
+    assert not trace_recorder.is_recording()
+
+
+def test_recording_stops_early(tmp_path):
+    path = str(tmp_path / 'trace.jsonl')
+    assert record_for(60, path=path) == path
+    recorder = trace_recorder._recorder
+    trace_recorder.record('focus', app='discord.exe')
+    assert trace_recorder.stop_recording() == path
+    assert not trace_recorder.is_recording()
+    # The timer is cancelled rather than left to fire in a minute
+    recorder.timer.join(timeout=5)
+    assert not recorder.timer.is_alive()
+    # Late events from a hook thread are dropped, not written to the closed file
+    recorder.add('hotkey', {'app': 'discord.exe', 'action': 'up'})
+    assert trace_recorder.stop_recording() is None
+
+    _, events = read_trace(path)
+    assert [event['e'] for event in events] == ['focus']
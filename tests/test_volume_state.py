@@ -0,0 +1,75 @@
+from audio_sessions import FakeAudioBackend, FakeSession, apply_batch, apply_hotkey
+from scenes import activate_scene
+from volume_state import VolumeStateStore
+
+
+def tracked(*sessions):
+    backend = FakeAudioBackend(sessions)
+    store = VolumeStateStore()
+    store.track(backend)
+    return backend, store
+
+
+def test_last_session_gone_publishes_none():
+    backend, store = tracked(('discord.exe', 0.5, False))
+    changes = []
+    store.subscribe(lambda *change: changes.append(change))
+    backend.remove_session(backend.sessions[0].pid)
+    assert changes == [('discord.exe', None, None)]
+    assert store.get_app('discord.exe') is None
+
+
+def test_remaining_session_keeps_the_app():
+    backend, store = tracked(('discord.exe', 0.5, True), ('discord.exe', 0.8, False))
+    changes = []
+    store.subscribe(lambda *change: changes.append(change))
+    backend.remove_session(backend.sessions[1].pid)
+    assert changes == [('discord.exe', 0.5, True)]
+
+
+def test_batch_delivers_once():
+    backend, store = tracked(('discord.exe', 0.5, False), ('brave.exe', 0.8, False))
+    batches = []
+    store.subscribe_batch(batches.append)
+    apply_batch(backend, [{'op': 'set', 'app': 'discord.exe', 'volume': 20},
+                          {'op': 'mute', 'app': 'brave.exe'},
+                          {'op': 'set', 'app': 'discord.exe', 'volume': 30}], store)
+    assert batches == [{'discord.exe': (0.3, False), 'brave.exe': (0.8, True)}]
+
+
+def test_scene_is_one_batch():
+    backend, store = tracked(('discord.exe', 0.5, False), ('brave.exe', 0.8, False), ('spotify.exe', 0.4, True))
+    batches = []
+    store.subscribe_batch(batches.append)
+    scene = {'apps': {'discord.exe': {'volume': 80}, 'brave.exe': {'muted': True},
+                      'spotify.exe': {'muted': False}}}
+    _, muted_changes = activate_scene(backend, scene, store)
+    assert len(batches) == 1
+    assert set(batches[0]) == set(muted_changes) == {'discord.exe', 'brave.exe', 'spotify.exe'}
+
+
+def test_unchanged_state_is_not_published():
+    backend, store = tracked(('discord.exe', 0.5, False))
+    changes = []
+    store.subscribe(lambda *change: changes.append(change))
+    apply_batch(backend, [{'op': 'set', 'app': 'discord.exe', 'volume': 50}], store)
+    assert changes == []
+
+
+def test_tracked_hotkey_skips_the_audio_api():
+    backend, store = tracked(('discord.exe', 0.5, False), ('discord.exe', 0.3, True))
+    reads = [session.reads for session in backend.sessions]
+    enumerations = backend.enumerations
+    assert apply_hotkey(backend, 'discord.exe', 'up', store) == ('discord.exe', 0.55)
+    assert apply_hotkey(backend, 'disc*.exe', 'mute', store) == ('disc*.exe', 0)
+    assert [session.reads for session in backend.sessions] == reads
+    assert backend.enumerations == enumerations
+
+
+def test_untracked_app_falls_back_to_one_enumeration():
+    backend, store = tracked(('discord.exe', 0.5, False))
+    enumerations = backend.enumerations
+    # Started before the store was told about it
+    backend.sessions.append(FakeSession('brave.exe', 4242, 0.8, False, backend))
+    assert apply_hotkey(backend, 'brave.exe', 'down', store) == ('brave.exe', 0.75)
+    assert backend.enumerations == enumerations + 1
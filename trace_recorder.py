@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import threading
+from profiler_capture import user_data_dir
+
+TRACE_VERSION = 1
+# Longest timed recording, in seconds
+MAX_RECORD_SECONDS = 300
+
+# The recording in progress, if any; record() is a no-op without one
+_recorder = None
+
+
+def record(kind, **fields):
+    """Log an input event ('hotkey', 'focus', 'session_start', 'process_exit', ...)"""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.add(kind, fields)
+
+
+def is_recording():
+    return _recorder is not None
+
+
+def stop_recording():
+    """Stop the recording in progress; returns its trace path, or None if there was none"""
+    recorder = _recorder
+    if recorder is None:
+        return None
+    return recorder.stop()
+
+
+def capture_snapshot(backend, process_table=None):
+    """Starting state for a trace: audio sessions, running processes and the focused app"""
+    sessions = [{'pid': session.pid, 'app': session.name, 'volume': session.get_volume(),
+                 'muted': bool(session.get_mute())}
+                for session in backend.enumerate_sessions()]
+    processes = process_table() if process_table is not None else {}
+    return {
+        'sessions': sessions,
+        'processes': [{'pid': pid, 'name': name} for pid, name in processes.items()],
+        'focused': backend.get_focused_app(),
+    }
+
+
+class TraceRecorder:
+    """Writes timestamped input events to a JSONL trace.
+
+    The first line is a header with the state at the start (see
+    capture_snapshot); every other line is one event with its time
+    in milliseconds since the start in 't' and its kind in 'e'. Events are
+    buffered and serialised in batches so recording stays cheap on the
+    keyboard hook and audio notification threads.
+    """
+    def __init__(self, path=None, flush_every=256):
+        if path is None:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(user_data_dir(), "traces", f"trace-{stamp}.jsonl")
+        self.path = path
+        self.flush_every = flush_every
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.started = None
+        self.file = None
+        # Set by record_for; cancelled when the recording is stopped early
+        self.timer = None
+
+    def start(self, snapshot=None):
+        global _recorder
+        if _recorder is not None:
+            raise RuntimeError("A trace recording is already running")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.file = open(self.path, 'w', encoding='utf-8')
+        header = {'version': TRACE_VERSION, 'started': time.time(),
+                  'snapshot': snapshot or {'sessions': [], 'processes': [], 'focused': None}}
+        self.file.write(json.dumps(header) + '\n')
+        self.started = time.perf_counter()
+        _recorder = self
+        return self.path
+
+    def add(self, kind, fields):
+        t = (time.perf_counter() - self.started) * 1000
+        with self.lock:
+            # A hook thread may still be inside record() when stop() runs
+            if self.file is None:
+                return
+            self.buffer.append((t, kind, fields))
+            if len(self.buffer) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        lines = []
+        for t, kind, fields in self.buffer:
+            event = {'t': round(t, 3), 'e': kind}
+            event.update(fields)
+            lines.append(json.dumps(event, separators=(',', ':')))
+        self.buffer = []
+        if lines:
+            self.file.write('\n'.join(lines) + '\n')
+
+    def stop(self):
+        global _recorder
+        if _recorder is self:
+            _recorder = None
+        if self.timer is not None:
+            self.timer.cancel()
+        with self.lock:
+            if self.file is not None:
+                self._flush()
+                self.file.close()
+                self.file = None
+        return self.path
+
+
+def record_for(seconds, path=None, snapshot=None):
+    """Record for a fixed time in the background; returns the trace path.
+
+    stop_recording() ends it early.
+    """
+    # Timer overflows on inf and would wait forever on huge values
+    if not 0 < seconds <= MAX_RECORD_SECONDS:
+        raise ValueError(f"Recording length must be more than 0 and at most {MAX_RECORD_SECONDS} seconds")
+    recorder = TraceRecorder(path)
+    recorder.timer = threading.Timer(seconds, recorder.stop)
+    recorder.timer.daemon = True
+    trace_path = recorder.start(snapshot)
+    recorder.timer.start()
+    return trace_path
+
+
+def read_trace(path):
+    """Return the header and the list of events of a trace file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('version') != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version: {header.get('version')}")
+        events = [json.loads(line) for line in f if line.strip()]
+    return header, events
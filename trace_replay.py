@@ -0,0 +1,142 @@
+import argparse
+import statistics
+import time
+from collections import defaultdict
+from audio_sessions import FakeAudioBackend, apply_hotkey
+from process_watcher import FakeProcessTable, ProcessWatcher
+from trace_recorder import read_trace
+from volume_state import VolumeStateStore
+
+
+class NullOverlay:
+    """Headless stand-in for VolumeOverlay that keeps the same state"""
+    def __init__(self):
+        self.shows = 0
+        self.current = None
+        self.muted_apps = set()
+        self.process_watcher = None
+
+    def show(self, app_name, volume_percent):
+        self.shows += 1
+        self.current = (app_name, volume_percent)
+
+    def apply_state_changes(self, changes):
+        for app_name, state in changes.items():
+            if state is not None and (state[1] or state[0] == 0):
+                self.muted_apps.add(app_name)
+            else:
+                self.muted_apps.discard(app_name)
+
+    def attach_process_watcher(self, watcher):
+        self.process_watcher = watcher
+        watcher.subscribe(self.handle_process_events)
+
+    def handle_process_events(self, events):
+        # Same rule as VolumeOverlay: an app leaves the strip with its last process
+        self.muted_apps -= self.process_watcher.gone_apps(events, self.muted_apps)
+
+
+class TraceReplayer:
+    """Feeds a recorded trace through the dispatch, audio and overlay layers.
+
+    Runs against the fake audio backend and a scripted process table, seeded
+    from the snapshot in the trace header, so field traces replay the same
+    way on Linux. speed=1 keeps the recorded timing, higher values compress
+    it and 0 replays back to back. Pass a real VolumeOverlay to include Tk
+    rendering in the measured latency.
+    """
+    def __init__(self, events, speed=0, overlay=None, snapshot=None):
+        self.events = events
+        self.speed = speed
+        self.backend = FakeAudioBackend()
+        self.process_table = FakeProcessTable()
+        self.watcher = ProcessWatcher(process_table=self.process_table)
+        self.state_store = VolumeStateStore()
+        self.overlay = overlay or NullOverlay()
+        self.latencies = defaultdict(list)
+
+        # Recreate what already existed when recording started
+        snapshot = snapshot or {}
+        for session in snapshot.get('sessions', []):
+            self.backend.add_session(session['app'], pid=session['pid'],
+                                     volume=session['volume'], muted=session['muted'])
+        for process in snapshot.get('processes', []):
+            self.process_table.start(process['name'], pid=process['pid'])
+        self.backend.focused_app = snapshot.get('focused')
+
+        if hasattr(self.overlay, 'window'):
+            # A real overlay hands state changes to Tk with after(); flush them per event
+            self.overlay.attach_state_store(self.state_store)
+        else:
+            self.state_store.subscribe_batch(self.overlay.apply_state_changes)
+        self.overlay.attach_process_watcher(self.watcher)
+        # Seeding after subscribing puts apps muted at the start on the strip
+        self.state_store.track(self.backend)
+        self.watcher.poll()
+
+    def run(self):
+        started = time.perf_counter()
+        for event in self.events:
+            if self.speed:
+                delay = event['t'] / self.speed / 1000 - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            t0 = time.perf_counter()
+            self.dispatch(event)
+            if hasattr(self.overlay, 'window'):
+                self.overlay.window.update()
+            self.latencies[event['e']].append(time.perf_counter() - t0)
+        return self.report()
+
+    def dispatch(self, event):
+        kind = event['e']
+        if kind == 'hotkey':
+            overlay_state = apply_hotkey(self.backend, event['app'], event['action'], self.state_store)
+            if overlay_state is not None:
+                self.overlay.show(*overlay_state)
+        elif kind == 'focus':
+            self.backend.focused_app = event['app']
+        elif kind == 'session_start':
+            self.backend.add_session(event['app'], pid=event['pid'],
+                                     volume=event.get('volume', 1.0), muted=event.get('muted', False))
+        elif kind == 'session_exit':
+            self.backend.remove_session(event['pid'])
+        elif kind == 'process_start':
+            self.process_table.start(event['name'], pid=event['pid'])
+            self.watcher.poll()
+        elif kind == 'process_exit':
+            self.process_table.exit(event['pid'])
+            self.watcher.poll()
+
+    def report(self):
+        """Per event kind: count and latency mean/p50/p95/max in milliseconds"""
+        report = {}
+        for kind, samples in self.latencies.items():
+            ordered = sorted(samples)
+            report[kind] = {
+                'count': len(samples),
+                'mean': statistics.mean(samples) * 1000,
+                'p50': statistics.median(samples) * 1000,
+                'p95': ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1000,
+                'max': ordered[-1] * 1000,
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded input trace and report per-event latency")
+    parser.add_argument('trace')
+    parser.add_argument('--speed', type=float, default=0,
+                        help="1 for recorded timing, >1 to speed up, 0 (default) for no waits")
+    args = parser.parse_args()
+
+    header, events = read_trace(args.trace)
+    report = TraceReplayer(events, speed=args.speed, snapshot=header.get('snapshot')).run()
+    print(f"{'event':<15}{'count':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for kind, stats in sorted(report.items()):
+        print(f"{kind:<15}{stats['count']:>7}{stats['mean']:>10.3f}{stats['p50']:>10.3f}"
+              f"{stats['p95']:>10.3f}{stats['max']:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+import threading
+from contextlib import contextmanager
+from app_targets import get_target
+import trace_recorder
+
+
+class VolumeStateStore:
+    """Current volume and mute of every tracked audio session.
+
+    The audio backend keeps it current through session change notifications
+    (its listener interface is session_changed/session_removed), so the hotkey
+    path and the overlay read cached state instead of the audio API.
+    Subscribers are called with (app_name, volume, muted) whenever the
+    aggregated state of an app changes, from whichever thread reported it,
+    and with (app_name, None, None) when its last session is gone. Batch
+    subscribers get the same changes as one {app_name: (volume, muted) or
+    None} map per batch() block.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        # pid -> [name, volume, muted]
+        self.sessions = {}
+        self.subscribers = []
+        self.batch_subscribers = []
+        # Changes held back while a batch() block is open, last state per app wins
+        self._batch_depth = 0
+        self._pending = {}
+
+    def track(self, backend):
+        """Subscribe to a backend's notifications and seed from one enumeration"""
+        backend.watch_sessions(self)
+        for session in backend.enumerate_sessions():
+            self.session_changed(session.pid, session.name, session.get_volume(), session.get_mute())
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def subscribe_batch(self, callback):
+        """Register callback(changes) to get each batch of changes in one call"""
+        self.batch_subscribers.append(callback)
+
+    def unsubscribe_batch(self, callback):
+        if callback in self.batch_subscribers:
+            self.batch_subscribers.remove(callback)
+
+    @contextmanager
+    def batch(self):
+        """Hold back publishes until the block ends, then deliver them once per app"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                changes = self._pending if self._batch_depth == 0 else None
+                if changes is not None:
+                    self._pending = {}
+            if changes:
+                self._deliver(changes)
+
+    def session_changed(self, pid, name, volume, muted):
+        if pid not in self.sessions:
+            trace_recorder.record('session_start', pid=pid, app=name, volume=volume, muted=bool(muted))
+        with self._lock:
+            before = self._app_state(name)
+            self.sessions[pid] = [name, volume, bool(muted)]
+            after = self._app_state(name)
+        if after != before:
+            self._publish(name, after)
+
+    def session_removed(self, pid):
+        with self._lock:
+            session = self.sessions.pop(pid, None)
+            if session is None:
+                return
+            trace_recorder.record('session_exit', pid=pid)
+            name = session[0]
+            after = self._app_state(name)
+        # None tells subscribers the app has no sessions left
+        self._publish(name, after)
+
+    def set_sessions(self, sessions, volume=None, muted=None):
+        """Write our own change through to the cache before the notification arrives"""
+        for session in sessions:
+            entry = self.sessions.get(session.pid)
+            if entry is None:
+                continue
+            self.session_changed(session.pid, session.name,
+                                 entry[1] if volume is None else volume,
+                                 entry[2] if muted is None else muted)
+
+    def tracked_pids(self):
+        with self._lock:
+            return list(self.sessions)
+
+    def get_sessions_state(self, sessions):
+        """Aggregated (volume, muted) for the given sessions, or None if any is untracked"""
+        with self._lock:
+            entries = [self.sessions.get(session.pid) for session in sessions]
+        if not entries or None in entries:
+            return None
+        return self._aggregate(entries)
+
+    def get_app(self, app_name):
+        """Aggregated (volume, muted) for an app name or pattern, or None"""
+        target = get_target(app_name)
+        with self._lock:
+            entries = [entry for entry in self.sessions.values() if target.matches(entry[0])]
+        if not entries:
+            return None
+        return self._aggregate(entries)
+
+    def _app_state(self, name):
+        name = name.lower()
+        entries = [entry for entry in self.sessions.values() if entry[0].lower() == name]
+        return self._aggregate(entries) if entries else None
+
+    def _aggregate(self, entries):
+        # Same rule as audio_sessions.session_state: loudest level, muted only if all are
+        return max(entry[1] for entry in entries), all(entry[2] for entry in entries)
+
+    def _publish(self, name, state):
+        with self._lock:
+            if self._batch_depth:
+                self._pending[name] = state
+                return
+        self._deliver({name: state})
+
+    def _deliver(self, changes):
+        for name, state in changes.items():
+            volume, muted = state if state is not None else (None, None)
+            for callback in list(self.subscribers):
+                try:
+                    callback(name, volume, muted)
+                except Exception as e:
+                    print(f"Error in volume state handler: {e}")
+        for callback in list(self.batch_subscribers):
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"Error in volume state handler: {e}")